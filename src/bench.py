@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Benchmarks locais do pipeline (sem navegador nem rede)
+
+Uso: python src/bench.py
+"""
+import os
+import io
+import sys
+import time
+import json
+import asyncio
+import contextlib
+import statistics
+import subprocess
+import tempfile
+import tracemalloc
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from professional import Professional, orjson
+from exporters import export_professionals, get_exporter
+from cities import get_all_cities
+from clock import VirtualClock
+from orchestrator import run_sequential
+
+
+def _synthetic_rows(n: int):
+    """Gera n registros sintéticos distribuídos pelas 100 cidades"""
+    cities = get_all_cities()
+    for i in range(n):
+        city, state = cities[i % len(cities)]
+        yield dict(
+            nome=f"Guincho Exemplo {i}",
+            telefone=f"11{900000000 + i}",
+            # Strings novas a cada registro, como viriam do parsing do HTML
+            cidade="".join(city.replace("-", " ").title()),
+            estado="".join(state.upper()),
+            categoria="".join(["Guincho", " 24h"]),
+            url_perfil=f"https://example.com/guincho/{i}",
+            data_coleta="".join(["2026-", "01-01"]),
+        )
+
+
+def _measure_memory(factory: Callable, n: int) -> int:
+    """Retorna bytes alocados para manter n registros vivos"""
+    tracemalloc.start()
+    records = [factory(row) for row in _synthetic_rows(n)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return current
+
+
+def _as_dict(row: Dict) -> Dict:
+    """Registro no formato antigo (dict de 11 chaves)"""
+    return {
+        "nome": row["nome"].strip()[:100],
+        "telefone": row["telefone"],
+        "cidade": row["cidade"],
+        "estado": row["estado"],
+        "categoria": row["categoria"],
+        "avaliacao_nota": None,
+        "avaliacao_total": 0,
+        "servicos_negociados": 0,
+        "tempo_getninjas": "N/A",
+        "url_perfil": row["url_perfil"],
+        "data_coleta": row["data_coleta"],
+    }
+
+
+def bench_professional(n: int = 100_000) -> Dict:
+    """Compara memória e gravação do JSON: lista de dicts vs JSONExporter (produção)"""
+    dict_bytes = _measure_memory(_as_dict, n)
+    slots_bytes = _measure_memory(lambda row: Professional(**row), n)
+
+    dicts = [_as_dict(row) for row in _synthetic_rows(n)]
+    records = [Professional(**row) for row in _synthetic_rows(n)]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        start = time.perf_counter()
+        with open(os.path.join(tmp_dir, "dicts.json"), 'wb') as f:
+            f.write(json.dumps(dicts, indent=2, ensure_ascii=False).encode('utf-8'))
+        dict_dump = time.perf_counter() - start
+
+        start = time.perf_counter()
+        export_professionals(records, "json", tmp_dir)
+        slots_dump = time.perf_counter() - start
+
+    return {
+        "registros": n,
+        "bytes_por_registro_dict": dict_bytes / n,
+        "bytes_por_registro_professional": slots_bytes / n,
+        "reducao_memoria": dict_bytes / slots_bytes,
+        "serializacao_dict_s": dict_dump,
+        "serializacao_professional_s": slots_dump,
+        "backend_json": "orjson" if orjson is not None else "json",
+    }
+
+
+def _time_command(argv: List[str], runs: int) -> float:
+    """Mediana (ms) do tempo de execução de um processo Python"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable] + argv,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=False,
+        )
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def bench_cli_startup(runs: int = 5) -> Dict:
+    """Tempo de inicialização dos subcomandos leves (meta: < 100 ms)"""
+    main_py = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+
+    # Arquivo pequeno só para o deliver --dry-run ter o que ler
+    sample = os.path.join("output", "bench", "amostra.json")
+    os.makedirs(os.path.dirname(sample), exist_ok=True)
+    with get_exporter("json", sample) as exporter:
+        exporter.write_all(Professional(**row) for row in _synthetic_rows(20))
+
+    return {
+        "python_vazio_ms": _time_command(["-c", "pass"], runs),
+        "plan_ms": _time_command([main_py, "plan"], runs),
+        "deliver_dry_run_ms": _time_command([main_py, "deliver", sample, "--dry-run"], runs),
+    }
+
+
+def bench_schedule_simulation(n_cities: int = 1000, seed: int = 42) -> Dict:
+    """
+    Simula o cronograma sequencial em tempo virtual
+
+    Cada cidade "custa" uma latência sorteada (navegação + extração) e o
+    orquestrador real aplica os delays entre cidades no mesmo relógio.
+    """
+    clock = VirtualClock(seed=seed)
+    cities = [get_all_cities()[i % len(get_all_cities())] for i in range(n_cities)]
+
+    async def fake_scrape(city: str, state: str):
+        # 3-5 s de espera pós-navegação + 5-90 s de página/extração
+        await clock.sleep(clock.uniform(3, 5) + clock.uniform(5, 90))
+        return []
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        asyncio.run(run_sequential(cities, fake_scrape, clock=clock))
+    wall = time.perf_counter() - start
+
+    return {
+        "cidades": n_cities,
+        "tempo_simulado_h": clock.now() / 3600,
+        "cidades_por_dia": n_cities / (clock.now() / 86400),
+        "tempo_real_s": wall,
+    }
+
+
+BENCHMARKS = {
+    "professional": bench_professional,
+    "cli_startup": bench_cli_startup,
+    "schedule_simulation": bench_schedule_simulation,
+}
+
+
+def run_benchmarks(only: List[str] = None) -> Dict:
+    """Executa benchmarks (todos ou só os nomeados) e imprime resultados"""
+    results = {}
+    for name, bench in BENCHMARKS.items():
+        if only and name not in only:
+            continue
+
+        print(f"⏱️  {name}...")
+        results[name] = bench()
+        for key, value in results[name].items():
+            if isinstance(value, float):
+                print(f"   {key}: {value:.3f}")
+            else:
+                print(f"   {key}: {value}")
+    return results
+
+
+if __name__ == "__main__":
+    run_benchmarks()
@@ -2,6 +2,7 @@
 Lista de 100 cidades brasileiras para scraping rotativo
 Divididas em grupos para rotacao diaria
 """
+import config
 
 # Lista completa de 100 cidades brasileiras (cidade, UF)
 CITIES_LIST = [
@@ -117,30 +118,36 @@ CITIES_LIST = [
 ]
 
 
-def get_daily_cities():
+def get_daily_cities(day_of_year=None):
     """
-    Retorna 5 cidades para scraping diario (meta: 100 profissionais/dia)
-    Rotaciona atraves das 100 cidades em 20 dias
+    Retorna MAX_CITIES_PER_DAY cidades para scraping diario (padrao 5: meta 100 profissionais/dia)
+    Rotaciona atraves das 100 cidades (20 dias com o padrao)
+    
+    Args:
+        day_of_year: Dia do ano (1-366); padrao: hoje
     
     Returns:
-        Lista de 5 tuplas (cidade, uf)
+        Lista de tuplas (cidade, uf)
     """
     import datetime
     
     # Usar dia do ano para rotacao (1-365)
-    day_of_year = datetime.date.today().timetuple().tm_yday
+    if day_of_year is None:
+        day_of_year = datetime.date.today().timetuple().tm_yday
     
-    # Cada grupo tem 5 cidades
+    # Cada grupo tem MAX_CITIES_PER_DAY cidades (perfil do tune pode mudar)
     # 100 cidades / 5 = 20 grupos
     # Roda tudo em 20 dias, depois reinicia
-    group_index = (day_of_year - 1) % 20
+    group_size = max(1, min(config.MAX_CITIES_PER_DAY, len(CITIES_LIST)))
+    groups = -(-len(CITIES_LIST) // group_size)
+    group_index = (day_of_year - 1) % groups
     
-    start_index = group_index * 5
-    end_index = start_index + 5
+    start_index = group_index * group_size
+    end_index = start_index + group_size
     
     cities = CITIES_LIST[start_index:end_index]
     
-    print(f"📍 Dia {day_of_year} do ano - Grupo {group_index + 1}/20")
+    print(f"📍 Dia {day_of_year} do ano - Grupo {group_index + 1}/{groups}")
     print(f"🏙️  Cidades selecionadas: {len(cities)}")
     for city, state in cities:
         city_name = city.replace("-", " ").title()
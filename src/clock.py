@@ -0,0 +1,139 @@
+"""
+Relógio injetável para todos os delays, pausas aleatórias e timeouts
+
+Todo o código de pacing usa o relógio corrente (get_clock()) em vez de
+chamar asyncio.sleep/random diretamente. Isso permite:
+
+- RealClock(seed): tempo real com sorteios reproduzíveis
+- VirtualClock(seed): tempo simulado; sleeps avançam o relógio sem
+  esperar, então um dia inteiro de cronograma roda em segundos
+
+O VirtualClock serve para simulações sem I/O real (benchmarks,
+planejamento de capacidade): ele avança o tempo quando as tarefas prontas
+já tiveram chance de rodar.
+"""
+import asyncio
+import heapq
+import random
+import time
+from typing import Awaitable, Optional
+
+
+class Clock:
+    """Interface comum: tempo, espera, sorteio e timeout"""
+
+    def __init__(self, seed: Optional[int] = None):
+        self.seed = seed
+        self.random = random.Random(seed)
+
+    def now(self) -> float:
+        """Segundos (monotônicos) desde uma origem arbitrária"""
+        raise NotImplementedError
+
+    async def sleep(self, seconds: float):
+        """Espera a quantidade de segundos no tempo deste relógio"""
+        raise NotImplementedError
+
+    def uniform(self, a: float, b: float) -> float:
+        """Sorteio uniforme com a fonte aleatória (semeada) do relógio"""
+        return self.random.uniform(a, b)
+
+    async def wait_for(self, aw: Awaitable, timeout: Optional[float]):
+        """
+        Igual a asyncio.wait_for, mas medindo o timeout neste relógio
+
+        Raises:
+            asyncio.TimeoutError: Se o timeout esgotar (a tarefa é cancelada)
+        """
+        task = asyncio.ensure_future(aw)
+        if timeout is None:
+            return await task
+
+        timer = asyncio.ensure_future(self.sleep(timeout))
+        try:
+            done, _ = await asyncio.wait({task, timer}, return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:
+            task.cancel()
+            timer.cancel()
+            raise
+
+        if task in done:
+            timer.cancel()
+            return task.result()
+
+        task.cancel()
+        raise asyncio.TimeoutError()
+
+
+class RealClock(Clock):
+    """Tempo real (asyncio.sleep + time.monotonic)"""
+
+    def now(self) -> float:
+        return time.monotonic()
+
+    async def sleep(self, seconds: float):
+        await asyncio.sleep(max(0.0, seconds))
+
+
+class VirtualClock(Clock):
+    """
+    Tempo simulado e determinístico
+
+    Cada sleep entra em uma fila de prioridade pelo instante de despertar.
+    Uma tarefa "motor" deixa o event loop rodar o que estiver pronto
+    (settle_rounds iterações) e então salta o relógio para o próximo
+    despertar.
+    """
+
+    def __init__(self, seed: Optional[int] = 0, start: float = 0.0, settle_rounds: int = 10):
+        super().__init__(seed)
+        self._now = start
+        self.settle_rounds = settle_rounds
+        self._sleepers = []
+        self._seq = 0
+        self._driver = None
+
+    def now(self) -> float:
+        return self._now
+
+    async def sleep(self, seconds: float):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        heapq.heappush(self._sleepers, (self._now + max(0.0, seconds), self._seq, future))
+        self._seq += 1
+
+        if self._driver is None or self._driver.done():
+            self._driver = loop.create_task(self._drive())
+
+        await future
+
+    async def _drive(self):
+        while self._sleepers:
+            # Deixar as tarefas prontas avançarem antes de saltar no tempo
+            for _ in range(self.settle_rounds):
+                await asyncio.sleep(0)
+
+            if not self._sleepers:
+                break
+
+            wake_at, _, future = heapq.heappop(self._sleepers)
+            if future.done():
+                continue  # sleep cancelado
+
+            self._now = max(self._now, wake_at)
+            future.set_result(None)
+
+
+_clock: Clock = RealClock()
+
+
+def get_clock() -> Clock:
+    """Relógio corrente do processo"""
+    return _clock
+
+
+def set_clock(clock: Clock) -> Clock:
+    """Troca o relógio do processo e retorna o anterior"""
+    global _clock
+    previous, _clock = _clock, clock
+    return previous
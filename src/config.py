@@ -1,6 +1,11 @@
 """
 Configurações centralizadas do scraper Google Maps para guinchos
+
+Os parâmetros de pacing/timeouts podem ser sobrescritos por um perfil
+medido (python src/main.py tune), escolhido com SCRAPER_PROFILE=<nome>.
 """
+import json
+import os
 
 # URLs Base
 # URLs Base
@@ -11,6 +16,21 @@ MAX_PROFESSIONALS_PER_CITY = 20  # 20 por cidade
 MAX_CITIES_PER_DAY = 5  # 5 cidades por dia = 100 profissionais/dia
 SCROLL_ATTEMPTS = 15  # Mais scrolls para carregar 20 profissionais
 
+# Backend de fetch: "browser" (Playwright) ou "http" (httpx, cai no navegador se preciso)
+FETCH_BACKEND = "browser"
+HTTP_POOL_SIZE = 10  # Conexões keep-alive por proxy
+
+# Entrega progressiva via Telegram (lotes enviados durante o scraping)
+PROGRESSIVE_DELIVERY = True
+DELIVERY_BATCH_SIZE = 50        # Registros por lote
+DELIVERY_WINDOW_SECONDS = 300   # Envia lote parcial após 5 min
+DELIVERY_DIR = "output/delivery"
+
+# Pipeline fetch → parse (--pipeline)
+FETCH_CONCURRENCY = 2  # Cidades baixadas em paralelo
+PARSE_WORKERS = 2      # Processos de parsing
+PARSE_QUEUE_SIZE = 4   # Páginas aguardando parse antes de segurar o fetch
+
 # Delays (em segundos) - MAIS LENTOS para evitar bloqueio
 DELAY_MIN = 30  # 30 segundos mínimo entre cidades
 DELAY_MAX = 60  # 60 segundos máximo entre cidades
@@ -18,6 +38,9 @@ DELAY_BETWEEN_SCROLLS = 3  # 3 segundos entre scrolls
 DELAY_AFTER_CLICK = 2  # 2 segundos após clicar
 DELAY_BETWEEN_EXTRACTIONS = 1.5  # Delay entre extrair cada profissional
 
+# Prepara navegador/proxy da próxima cidade durante o delay entre cidades
+PREFETCH_BROWSER = True
+
 # Timeouts (em milissegundos)
 TIMEOUT_NAVIGATION = 90000  # 90 segundos
 TIMEOUT_ELEMENT = 15000     # 15 segundos
@@ -51,6 +74,55 @@ VIEWPORT = {
 # Campos obrigatórios
 REQUIRED_FIELDS = ['nome', 'telefone']
 
+# Formato padrão do arquivo de resultados (json, csv, parquet, sqlite)
+EXPORT_FORMAT = "json"
+
+# Diretório para guardar o HTML bruto (scrape --save-html / comando parse)
+HTML_ARCHIVE_DIR = "output/html"
+
+# Estado persistido entre execuções
+STATE_DIR = "output/state"
+SELECTOR_CACHE_FILE = f"{STATE_DIR}/selectors.json"
+STORAGE_STATE_DIR = f"{STATE_DIR}/storage"  # Cookies/consentimento por proxy
+STORAGE_STATE_MAX_AGE_HOURS = 72            # Depois disso, começa sessão nova
+
+# Telefones já coletados (filtro de Bloom): só telefones novos contam na cota
+KNOWN_PHONES_FILE = f"{STATE_DIR}/known_phones.bloom"
+KNOWN_PHONES_CAPACITY = 100000   # ~180 KB com 0,1% de falso positivo
+KNOWN_PHONES_ERROR_RATE = 0.001
+
+# Paginação da busca: para antes se uma página não trouxer telefone novo
+MAX_PAGES_PER_CITY = 3
+RESULTS_PER_PAGE = 50            # Parâmetro num= da URL
+MAX_ELEMENTS_PER_PAGE = 40       # Elementos lidos por página (cada um custa DELAY_BETWEEN_EXTRACTIONS)
+MAX_ELEMENTS_WITHOUT_NEW = 10    # Para a página após N telefones seguidos já conhecidos
+
+# Proxies no navegador
+USE_PROXY = False  # DESABILITADO TEMPORARIAMENTE PARA TESTE
+
+# Custo do tráfego de proxy (US$/GB) para o relatório; 0 = só mostra bytes
+PROXY_COST_PER_GB = 0.0
+
+# Hedge: segunda tentativa em outro proxy se a página não ficar pronta até o p95
+HEDGE_ENABLED = False
+HEDGE_PERCENTILE = 0.95
+HEDGE_LATENCY_WINDOW = 200     # Latências recentes usadas no p95
+HEDGE_MIN_SAMPLES = 5          # Abaixo disso, usa HEDGE_DEFAULT_DELAY
+HEDGE_DEFAULT_DELAY = 30.0     # Segundos
+HEDGE_MAX_RATE = 0.2           # Máximo de hedges por cidade (evita dobrar o tráfego)
+HEDGE_STATE_FILE = f"{STATE_DIR}/latencies.json"
+
+# Palavras dos botões de consentimento de cookies
+CONSENT_BUTTON_WORDS = ['aceitar', 'accept', 'concordo', 'agree']
+
+# Log estruturado de eventos (JSONL em segundo plano, ver event_log.py)
+LOG_DIR = "output/logs"
+LOG_CONSOLE_LEVEL = os.environ.get("LOG_LEVEL", "info")  # debug mostra cada registro
+LOG_SAMPLING = {             # Fração gravada no JSONL por evento (padrão 1.0)
+    "extract.record": 0.2,
+    "extract.local_pack_record": 0.2,
+}
+
 # Formato de data
 DATE_FORMAT = "%Y-%m-%d"
 
@@ -68,3 +140,45 @@ SELECTORS = {
     'website': 'a[data-tooltip="Abrir website"]',
     'address': 'button[data-item-id="address"]',
 }
+
+
+# Perfis de parâmetros medidos pelo comando tune (profiles/<nome>.json)
+PROFILES_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "profiles"))
+TUNABLE_PARAMETERS = (
+    "MAX_CITIES_PER_DAY", "DELAY_MIN", "DELAY_MAX", "DELAY_BETWEEN_EXTRACTIONS",
+    "TIMEOUT_NAVIGATION", "TIMEOUT_ELEMENT",
+)
+
+
+def profile_path(name: str) -> str:
+    """Caminho do perfil: nome em PROFILES_DIR ou caminho direto para um .json"""
+    if name.endswith(".json") or os.sep in name:
+        return name
+    return os.path.join(PROFILES_DIR, f"{name}.json")
+
+
+def apply_profile(name: str) -> dict:
+    """
+    Carrega um perfil e sobrescreve os parâmetros ajustáveis deste módulo
+
+    Returns:
+        Parâmetros aplicados (chaves fora de TUNABLE_PARAMETERS são ignoradas)
+    """
+    with open(profile_path(name), "r", encoding="utf-8") as f:
+        params = json.load(f).get("parametros", {})
+
+    applied = {key: value for key, value in params.items() if key in TUNABLE_PARAMETERS}
+    globals().update(applied)
+    return applied
+
+
+# Valores deste arquivo antes de qualquer perfil (o tune limita o crescimento por eles)
+PROFILE_DEFAULTS = {name: globals()[name] for name in TUNABLE_PARAMETERS}
+
+SCRAPER_PROFILE = os.environ.get("SCRAPER_PROFILE", "")
+
+if SCRAPER_PROFILE:
+    try:
+        apply_profile(SCRAPER_PROFILE)
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Perfil '{SCRAPER_PROFILE}' não carregado ({e}); usando valores padrão")
@@ -0,0 +1,134 @@
+"""
+Entrega progressiva de resultados via Telegram em segundo plano
+
+Cada cidade concluída entra na fila; um worker agrupa os registros por
+tamanho (DELIVERY_BATCH_SIZE) ou janela de tempo (DELIVERY_WINDOW_SECONDS)
+e envia o lote como arquivo, sem bloquear o scraping. Os envios síncronos
+do TelegramBot rodam em thread (asyncio.to_thread).
+
+Os registros passam pelos mesmos estágios normalize/validate do
+pós-processamento final (postprocess.py) antes de entrar na fila, para que
+os lotes entregues batam com o arquivo salvo.
+"""
+import asyncio
+from typing import List, Optional
+
+import config
+from clock import Clock, get_clock
+from event_log import get_event_log
+from exporters import export_professionals
+from postprocess import Normalize, PostProcessor, Validate
+from professional import Professional
+
+
+# Sinaliza fim da fila para o worker
+_CLOSE = object()
+
+
+class DeliveryQueue:
+    """Fila assíncrona de entrega em lotes"""
+
+    def __init__(self, telegram_bot, export_format: str = config.EXPORT_FORMAT,
+                 batch_size: int = config.DELIVERY_BATCH_SIZE,
+                 window_seconds: float = config.DELIVERY_WINDOW_SECONDS,
+                 output_dir: str = config.DELIVERY_DIR,
+                 clock: Optional[Clock] = None):
+        self.telegram_bot = telegram_bot
+        self.export_format = export_format
+        self.batch_size = max(1, batch_size)
+        self.window_seconds = window_seconds
+        self.output_dir = output_dir
+        self.clock = clock or get_clock()
+
+        self.sent_batches = 0
+        self.sent_records = 0
+        self.failed_batches = 0
+
+        # Mesmas regras do pós-processamento final (sem o dedupe: feito no worker)
+        self.cleaner = PostProcessor([Normalize(), Validate()])
+
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._seen_phones = set()
+        self._task = None
+
+    def start(self):
+        """Inicia o worker de envio em segundo plano"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def submit(self, professionals: List[Professional]):
+        """Normaliza, valida e enfileira os registros de uma cidade (não bloqueia)"""
+        professionals = list(self.cleaner.process(professionals))
+        if professionals:
+            self._queue.put_nowait(professionals)
+
+    async def close(self):
+        """Envia o que restou na fila e encerra o worker"""
+        if self._task is None:
+            return
+        self._queue.put_nowait(_CLOSE)
+        await self._task
+        self._task = None
+
+    async def _run(self):
+        batch: List[Professional] = []
+        deadline = None
+
+        while True:
+            timeout = None
+            if batch:
+                timeout = max(0.0, deadline - self.clock.now())
+
+            try:
+                item = await self.clock.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                # Janela de tempo esgotada: envia o lote parcial
+                await self._send(batch)
+                batch, deadline = [], None
+                continue
+
+            if item is _CLOSE:
+                await self._send(batch)
+                return
+
+            for prof in item:
+                # Não reenviar telefones já entregues em lotes anteriores
+                if prof.telefone in self._seen_phones:
+                    continue
+                self._seen_phones.add(prof.telefone)
+                batch.append(prof)
+
+            if batch and deadline is None:
+                deadline = self.clock.now() + self.window_seconds
+
+            while len(batch) >= self.batch_size:
+                await self._send(batch[:self.batch_size])
+                batch = batch[self.batch_size:]
+                deadline = self.clock.now() + self.window_seconds if batch else None
+
+    async def _send(self, batch: List[Professional]):
+        if not batch:
+            return
+
+        number = self.sent_batches + self.failed_batches + 1
+        try:
+            exporter = export_professionals(
+                batch, self.export_format, self.output_dir, prefix=f"guincho_lote{number:03d}"
+            )
+            success = await asyncio.to_thread(
+                self.telegram_bot.send_file,
+                exporter.path,
+                exporter.count,
+                len(set(p.cidade for p in batch)),
+                exporter.mime_type,
+            )
+        except Exception as e:
+            get_event_log().error("delivery.error", f"   ❌ Erro ao entregar lote {number}: {e}",
+                                  batch=number, records=len(batch), error=str(e))
+            success = False
+
+        if success:
+            self.sent_batches += 1
+            self.sent_records += len(batch)
+        else:
+            self.failed_batches += 1
@@ -0,0 +1,178 @@
+"""
+Log estruturado de eventos (JSONL) com escrita em segundo plano
+
+Cada evento tem nome, nível e campos livres. O hot path só monta um dict
+e o coloca numa fila; uma thread serializa e grava em lotes em
+output/logs/eventos_<run>.jsonl. Eventos frequentes (ex: cada registro
+extraído) podem ser amostrados por nome em LOG_SAMPLING: todos são
+contados, só a fração configurada vai para o arquivo.
+
+O console recebe apenas a mensagem dos eventos com nível >= LOG_CONSOLE_LEVEL
+e, no fechamento, um resumo legível das contagens.
+"""
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+import config
+from professional import orjson
+
+
+LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40}
+
+# Sinaliza fim da fila para a thread de escrita
+_CLOSE = object()
+
+
+def _dumps(record: Dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(record, default=str)
+    return json.dumps(record, ensure_ascii=False, default=str).encode('utf-8')
+
+
+class EventLog:
+    """
+    Registro de eventos com níveis, amostragem por evento e escrita assíncrona
+
+    Args:
+        directory: Diretório dos arquivos JSONL (None = não grava arquivo)
+        console_level: Nível mínimo para imprimir a mensagem no console
+        sampling: Fração gravada por nome de evento (padrão 1.0)
+        run_id: Identificador da execução (padrão: data e hora)
+    """
+
+    def __init__(self, directory: Optional[str] = config.LOG_DIR,
+                 console_level: str = config.LOG_CONSOLE_LEVEL,
+                 sampling: Optional[Dict[str, float]] = None,
+                 run_id: Optional[str] = None):
+        self.directory = directory
+        self.console_level = LEVELS.get(console_level, LEVELS["info"])
+        self.sampling = config.LOG_SAMPLING if sampling is None else sampling
+        self.run_id = run_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.path = os.path.join(directory, f"eventos_{self.run_id}.jsonl") if directory else None
+
+        self.counts: Dict[str, int] = {}
+        self.written = 0
+        self.levels_seen: Dict[str, int] = {}
+
+        self._every: Dict[str, int] = {
+            name: max(1, round(1 / rate)) for name, rate in self.sampling.items() if rate > 0
+        }
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._thread = None
+        self._closed = False
+
+    def event(self, name: str, level: str = "info", message: Optional[str] = None, **fields):
+        """
+        Registra um evento
+
+        Args:
+            name: Nome do evento (ex: "extract.record")
+            level: debug, info, warning ou error
+            message: Texto para o console (só se o nível passar do limite)
+            **fields: Campos do evento no JSONL
+        """
+        count = self.counts.get(name, 0) + 1
+        self.counts[name] = count
+        self.levels_seen[level] = self.levels_seen.get(level, 0) + 1
+
+        if message is not None and LEVELS.get(level, 20) >= self.console_level:
+            print(message)
+
+        # Amostragem determinística: 1 a cada N ocorrências (a primeira sempre entra)
+        rate = self.sampling.get(name, 1.0)
+        if rate <= 0 or (count - 1) % self._every.get(name, 1):
+            return
+
+        if self.path and not self._closed:
+            fields.update(ts=time.time(), run=self.run_id, event=name, level=level)
+            if message is not None:
+                fields.setdefault("msg", message)
+            self._ensure_writer()
+            self._queue.put(fields)
+
+    def debug(self, name: str, message: Optional[str] = None, **fields):
+        self.event(name, "debug", message, **fields)
+
+    def info(self, name: str, message: Optional[str] = None, **fields):
+        self.event(name, "info", message, **fields)
+
+    def warning(self, name: str, message: Optional[str] = None, **fields):
+        self.event(name, "warning", message, **fields)
+
+    def error(self, name: str, message: Optional[str] = None, **fields):
+        self.event(name, "error", message, **fields)
+
+    def _ensure_writer(self):
+        if self._thread is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._thread = threading.Thread(target=self._write_loop, name="event-log", daemon=True)
+            self._thread.start()
+
+    def _write_loop(self):
+        with open(self.path, 'ab') as f:
+            while True:
+                item = self._queue.get()
+                batch = [item]
+                # Drena o que já estiver na fila: uma escrita por lote
+                while True:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                closing = any(entry is _CLOSE for entry in batch)
+                lines = [_dumps(entry) for entry in batch if entry is not _CLOSE]
+                if lines:
+                    f.write(b"\n".join(lines) + b"\n")
+                    f.flush()
+                    self.written += len(lines)
+
+                if closing:
+                    return
+
+    def close(self):
+        """Grava o que restou na fila e encerra a thread (idempotente)"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None:
+            self._queue.put(_CLOSE)
+            self._thread.join()
+
+    def print_summary(self, top: int = 10):
+        """Resumo legível das contagens por evento"""
+        total = sum(self.counts.values())
+        if not total:
+            return
+        print(f"\n🧾 Eventos: {total} ({self.written} gravados{f' em {self.path}' if self.path else ''})")
+        for name, count in sorted(self.counts.items(), key=lambda x: x[1], reverse=True)[:top]:
+            sampled = f"  (amostra 1/{self._every[name]})" if self._every.get(name, 1) > 1 else ""
+            print(f"   {name}: {count}{sampled}")
+        problems = self.levels_seen.get("warning", 0) + self.levels_seen.get("error", 0)
+        if problems:
+            print(f"   ⚠️  {self.levels_seen.get('warning', 0)} avisos, {self.levels_seen.get('error', 0)} erros")
+
+
+_log: Optional[EventLog] = None
+
+
+def get_event_log() -> EventLog:
+    """Log de eventos do processo (criado no primeiro uso e fechado na saída)"""
+    global _log
+    if _log is None:
+        _log = EventLog()
+        atexit.register(_log.close)
+    return _log
+
+
+def set_event_log(log: EventLog) -> Optional[EventLog]:
+    """Troca o log do processo e retorna o anterior"""
+    global _log
+    previous, _log = _log, log
+    return previous
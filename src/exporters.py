@@ -0,0 +1,334 @@
+"""
+Exportadores incrementais de resultados (JSON, CSV, Parquet, SQLite)
+
+Cada exportador grava registro a registro, sem montar a lista inteira
+em memória. Uso:
+
+    with get_exporter("csv", "saida.csv") as exporter:
+        for prof in professionals:
+            exporter.write(prof)
+"""
+import csv
+import importlib.util
+import json
+import os
+import sqlite3
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple, Type
+
+from professional import FIELDS, Professional, orjson
+
+
+class Exporter:
+    """Interface base dos exportadores"""
+
+    format_name = ""
+    extension = ""
+    mime_type = "application/octet-stream"
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+
+    @staticmethod
+    def available() -> bool:
+        """Indica se as dependências do formato estão instaladas"""
+        return True
+
+    def open(self):
+        """Abre o destino para escrita"""
+        raise NotImplementedError
+
+    def write(self, professional: Professional):
+        """Grava um registro"""
+        raise NotImplementedError
+
+    def close(self):
+        """Finaliza e fecha o destino"""
+        raise NotImplementedError
+
+    def write_all(self, professionals: Iterable[Professional]) -> int:
+        """Grava todos os registros de um iterável e retorna o total gravado"""
+        for prof in professionals:
+            self.write(prof)
+        return self.count
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class JSONExporter(Exporter):
+    """Array JSON indentado, gravado incrementalmente"""
+
+    format_name = "json"
+    extension = ".json"
+    mime_type = "application/json"
+
+    def open(self):
+        self._file = open(self.path, 'wb')
+        self._file.write(b"[")
+
+    def write(self, professional: Professional):
+        row = professional.to_dict()
+        if orjson is not None:
+            content = orjson.dumps(row, option=orjson.OPT_INDENT_2)
+        else:
+            content = json.dumps(row, indent=2, ensure_ascii=False).encode('utf-8')
+
+        # Mesmo layout de json.dump(lista, indent=2)
+        content = content.replace(b"\n", b"\n  ")
+        self._file.write(b",\n  " if self.count else b"\n  ")
+        self._file.write(content)
+        self.count += 1
+
+    def close(self):
+        self._file.write(b"\n]" if self.count else b"]")
+        self._file.close()
+
+
+class CSVExporter(Exporter):
+    """CSV com cabeçalho (UTF-8 com BOM para abrir direto no Excel)"""
+
+    format_name = "csv"
+    extension = ".csv"
+    mime_type = "text/csv"
+
+    def open(self):
+        self._file = open(self.path, 'w', encoding='utf-8-sig', newline='')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(FIELDS)
+
+    def write(self, professional: Professional):
+        self._writer.writerow([getattr(professional, field) for field in FIELDS])
+        self.count += 1
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetExporter(Exporter):
+    """
+    Parquet com um row group por cidade (requer pyarrow)
+
+    Os registros chegam agrupados por cidade, então basta descarregar o
+    buffer quando a cidade muda.
+    """
+
+    format_name = "parquet"
+    extension = ".parquet"
+    mime_type = "application/vnd.apache.parquet"
+
+    # Limite de linhas por row group (cidades muito grandes são divididas)
+    max_rows_per_group = 50_000
+
+    @staticmethod
+    def available() -> bool:
+        return importlib.util.find_spec("pyarrow") is not None
+
+    def open(self):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("❌ Exportação Parquet requer pyarrow (pip install pyarrow)")
+
+        self._pa = pa
+        self._schema = pa.schema([
+            ('nome', pa.string()),
+            ('telefone', pa.string()),
+            ('cidade', pa.dictionary(pa.int32(), pa.string())),
+            ('estado', pa.dictionary(pa.int32(), pa.string())),
+            ('categoria', pa.dictionary(pa.int32(), pa.string())),
+            ('avaliacao_nota', pa.float64()),
+            ('avaliacao_total', pa.int32()),
+            ('servicos_negociados', pa.int32()),
+            ('tempo_getninjas', pa.string()),
+            ('url_perfil', pa.string()),
+            ('data_coleta', pa.string()),
+        ])
+        self._writer = pq.ParquetWriter(self.path, self._schema)
+        self._buffer = {field: [] for field in FIELDS}
+        self._buffer_city = None
+        self._buffered = 0
+
+    def _flush(self):
+        if not self._buffered:
+            return
+        table = self._pa.Table.from_pydict(self._buffer, schema=self._schema)
+        self._writer.write_table(table)
+        self._buffer = {field: [] for field in FIELDS}
+        self._buffered = 0
+
+    def write(self, professional: Professional):
+        if professional.cidade != self._buffer_city or self._buffered >= self.max_rows_per_group:
+            self._flush()
+            self._buffer_city = professional.cidade
+
+        for field in FIELDS:
+            self._buffer[field].append(getattr(professional, field))
+        self._buffered += 1
+        self.count += 1
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+
+
+class SQLiteExporter(Exporter):
+    """Arquivo SQLite autônomo com tabela `profissionais`"""
+
+    format_name = "sqlite"
+    extension = ".sqlite"
+    mime_type = "application/vnd.sqlite3"
+
+    batch_size = 500
+
+    def open(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute(
+            """
+            CREATE TABLE profissionais (
+                nome TEXT NOT NULL,
+                telefone TEXT NOT NULL,
+                cidade TEXT,
+                estado TEXT,
+                categoria TEXT,
+                avaliacao_nota REAL,
+                avaliacao_total INTEGER,
+                servicos_negociados INTEGER,
+                tempo_getninjas TEXT,
+                url_perfil TEXT,
+                data_coleta TEXT
+            )
+            """
+        )
+        self._insert = (
+            f"INSERT INTO profissionais ({', '.join(FIELDS)}) "
+            f"VALUES ({', '.join('?' for _ in FIELDS)})"
+        )
+        self._batch = []
+
+    def _flush(self):
+        if self._batch:
+            self._conn.executemany(self._insert, self._batch)
+            self._batch = []
+
+    def write(self, professional: Professional):
+        self._batch.append(tuple(getattr(professional, field) for field in FIELDS))
+        self.count += 1
+        if len(self._batch) >= self.batch_size:
+            self._flush()
+
+    def close(self):
+        self._flush()
+        self._conn.execute("CREATE INDEX idx_profissionais_estado_cidade ON profissionais (estado, cidade)")
+        self._conn.commit()
+        self._conn.close()
+
+
+EXPORTERS: Dict[str, Type[Exporter]] = {
+    exporter.format_name: exporter
+    for exporter in (JSONExporter, CSVExporter, ParquetExporter, SQLiteExporter)
+}
+
+
+def get_exporter_class(format_name: str) -> Type[Exporter]:
+    """
+    Retorna classe do exportador para o formato informado
+
+    Raises:
+        ValueError: Se o formato não for suportado
+    """
+    exporter_cls = EXPORTERS.get(format_name)
+    if exporter_cls is None:
+        raise ValueError(
+            f"Formato inválido: {format_name} (disponíveis: {', '.join(EXPORTERS)})"
+        )
+    return exporter_cls
+
+
+def get_exporter(format_name: str, path: str) -> Exporter:
+    """Instancia exportador do formato informado gravando em path"""
+    return get_exporter_class(format_name)(path)
+
+
+def export_professionals(
+    professionals: Iterable[Professional],
+    format_name: str,
+    output_dir: str,
+    prefix: str = "guincho",
+    timestamp: Optional[str] = None,
+) -> Exporter:
+    """
+    Exporta registros para um arquivo novo em output_dir
+
+    Returns:
+        Exportador já fechado (com path e count preenchidos)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    exporter_cls = get_exporter_class(format_name)
+
+    timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+    filepath = os.path.join(output_dir, f"{prefix}_{timestamp}{exporter_cls.extension}")
+
+    with exporter_cls(filepath) as exporter:
+        exporter.write_all(professionals)
+
+    return exporter
+
+
+def get_exporter_for_path(path: str) -> Type[Exporter]:
+    """Identifica o formato de um arquivo exportado pela extensão"""
+    extension = os.path.splitext(path)[1].lower()
+    for exporter_cls in EXPORTERS.values():
+        if exporter_cls.extension == extension:
+            return exporter_cls
+    raise ValueError(f"Extensão não reconhecida: {extension or path}")
+
+
+def summarize_export(path: str) -> Tuple[int, int]:
+    """
+    Conta registros e cidades de um arquivo já exportado
+
+    Returns:
+        Tupla (total de profissionais, total de cidades)
+    """
+    format_name = get_exporter_for_path(path).format_name
+
+    if format_name == "json":
+        with open(path, 'rb') as f:
+            content = f.read()
+        rows = orjson.loads(content) if orjson is not None else json.loads(content)
+        return len(rows), len(set(row.get('cidade', '') for row in rows))
+
+    if format_name == "csv":
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            rows = csv.DictReader(f)
+            cities = set()
+            total = 0
+            for row in rows:
+                total += 1
+                cities.add(row.get('cidade', ''))
+        return total, len(cities)
+
+    if format_name == "sqlite":
+        conn = sqlite3.connect(path)
+        try:
+            return conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT cidade) FROM profissionais"
+            ).fetchone()
+        finally:
+            conn.close()
+
+    import pyarrow.parquet as pq
+    table = pq.read_table(path, columns=['cidade'])
+    return table.num_rows, len(table.column('cidade').unique())
@@ -0,0 +1,173 @@
+"""
+Tentativas "hedged" para cortar a latência de cauda por cidade
+
+Se a tentativa principal não chegar a uma página de resultados pronta
+dentro do p95 observado, uma segunda tentativa começa (o ProxyManager
+entrega o próximo proxy da rotação). A primeira que terminar com
+resultados vence e a outra é cancelada. A taxa de hedges é limitada
+por HEDGE_MAX_RATE.
+"""
+import asyncio
+import json
+import math
+import os
+from collections import deque
+from typing import Awaitable, Callable, List, Optional
+
+import config
+from clock import Clock, get_clock
+from event_log import get_event_log
+
+
+# Tentativa: recebe callback on_ready (chamado quando a página de resultados está pronta)
+Attempt = Callable[[Callable[[], None]], Awaitable[List]]
+
+
+class HedgePolicy:
+    """Latências observadas (p95), limite de taxa e métricas de hedge"""
+
+    def __init__(self, state_file: Optional[str] = config.HEDGE_STATE_FILE,
+                 window: int = config.HEDGE_LATENCY_WINDOW,
+                 percentile: float = config.HEDGE_PERCENTILE,
+                 min_samples: int = config.HEDGE_MIN_SAMPLES,
+                 default_delay: float = config.HEDGE_DEFAULT_DELAY,
+                 max_rate: float = config.HEDGE_MAX_RATE):
+        self.state_file = state_file
+        self.latencies = deque(maxlen=window)
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.default_delay = default_delay
+        self.max_rate = max_rate
+
+        self.attempts = 0
+        self.hedges_fired = 0
+        self.hedges_won = 0
+        self.hedges_denied = 0
+
+        self._load()
+
+    def _load(self):
+        if not self.state_file or not os.path.exists(self.state_file):
+            return
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                self.latencies.extend(json.load(f).get('latencies', []))
+        except (OSError, ValueError):
+            pass
+
+    def save(self):
+        """Persiste as latências para a próxima execução"""
+        if not self.state_file:
+            return
+        os.makedirs(os.path.dirname(self.state_file) or ".", exist_ok=True)
+        with open(self.state_file, 'w', encoding='utf-8') as f:
+            json.dump({'latencies': list(self.latencies)}, f)
+
+    def observe(self, latency: float):
+        """Registra o tempo até a página de resultados ficar pronta"""
+        self.latencies.append(round(latency, 3))
+
+    def hedge_delay(self) -> float:
+        """Espera antes de disparar o hedge: p95 observado (ou padrão)"""
+        if len(self.latencies) < self.min_samples:
+            return self.default_delay
+        ordered = sorted(self.latencies)
+        idx = min(len(ordered) - 1, int(self.percentile * len(ordered)))
+        return ordered[idx]
+
+    def allow_hedge(self) -> bool:
+        """Respeita o limite de hedges por tentativa principal (arredondado para cima)"""
+        if self.hedges_fired + 1 > math.ceil(self.max_rate * self.attempts):
+            self.hedges_denied += 1
+            return False
+        return True
+
+    def print_summary(self):
+        """Imprime métricas de hedge no relatório final"""
+        if not self.attempts:
+            return
+        print(
+            f"\n🪁 Hedge: {self.hedges_fired} disparados, {self.hedges_won} vencidos, "
+            f"{self.hedges_denied} negados pelo limite ({self.max_rate:.0%}) "
+            f"em {self.attempts} cidades; gatilho atual {self.hedge_delay():.1f}s"
+        )
+
+
+async def run_hedged(attempt: Attempt, policy: HedgePolicy, clock: Optional[Clock] = None) -> List:
+    """
+    Executa a tentativa com hedge
+
+    Args:
+        attempt: Fábrica de tentativas; cada chamada deve usar outro proxy
+        policy: Política compartilhada pela execução
+        clock: Relógio do gatilho (padrão: relógio corrente)
+
+    Returns:
+        Resultado da primeira tentativa que terminar com dados (ou o último resultado)
+    """
+    clock = clock or get_clock()
+    policy.attempts += 1
+
+    def make_on_ready(event: asyncio.Event) -> Callable[[], None]:
+        start = clock.now()
+
+        def on_ready():
+            if not event.is_set():
+                event.set()
+                policy.observe(clock.now() - start)
+
+        return on_ready
+
+    ready = asyncio.Event()
+    primary_ready = make_on_ready(ready)
+    primary = asyncio.ensure_future(attempt(primary_ready))
+    ready_wait = asyncio.ensure_future(ready.wait())
+
+    try:
+        await clock.wait_for(
+            asyncio.wait({primary, ready_wait}, return_when=asyncio.FIRST_COMPLETED),
+            policy.hedge_delay(),
+        )
+        hedge_needed = False
+    except asyncio.TimeoutError:
+        hedge_needed = True
+    finally:
+        ready_wait.cancel()
+
+    if not hedge_needed or not policy.allow_hedge():
+        return await primary
+
+    log = get_event_log()
+    log.info("hedge.fired",
+             f"   🪁 Página não ficou pronta em {policy.hedge_delay():.1f}s, disparando hedge em outro proxy",
+             delay=policy.hedge_delay())
+    policy.hedges_fired += 1
+    hedge_ready = make_on_ready(asyncio.Event())
+    hedge = asyncio.ensure_future(attempt(hedge_ready))
+
+    pending = {primary, hedge}
+    result = []
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.cancelled() or task.exception() is not None:
+                    continue
+                result = task.result()
+                if result:
+                    if task is hedge:
+                        policy.hedges_won += 1
+                        log.info("hedge.won", "   🪁 Hedge venceu")
+                    return result
+        return result
+    finally:
+        # Perdedor cancelado (o finally do wrapper fecha o navegador)
+        if primary in pending:
+            # Amostra censurada da principal (desde o início dela): sem ela o p95
+            # perderia justamente as tentativas lentas. Hedge perdedor não conta:
+            # começou há pouco e puxaria o p95 para baixo
+            primary_ready()
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
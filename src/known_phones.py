@@ -0,0 +1,124 @@
+"""
+Filtro de Bloom persistente com todos os telefones já coletados
+
+Usado para contar só telefones novos na cota por cidade e parar a paginação
+quando uma página não traz nada novo. O arquivo é um cabeçalho fixo seguido
+do bytearray de bits: carregar é uma única leitura, sem parsing.
+
+Falso positivo = telefone novo tratado como conhecido (ele ainda é
+exportado, só não conta na cota). Não há falso negativo.
+"""
+import hashlib
+import math
+import os
+import struct
+from typing import Iterable, Optional
+
+import config
+
+
+# magic, k (hashes), m (bits), n (telefones inseridos)
+_HEADER = struct.Struct('<4sIQQ')
+_MAGIC = b'BLM1'
+
+
+class PhoneBloomFilter:
+    """
+    Filtro de Bloom dimensionado por capacidade e taxa de erro alvo
+
+    Posições por double hashing: h1 + i*h2 a partir de um único blake2b.
+    """
+
+    _shared = None
+
+    def __init__(self, capacity: int = config.KNOWN_PHONES_CAPACITY,
+                 error_rate: float = config.KNOWN_PHONES_ERROR_RATE,
+                 path: Optional[str] = config.KNOWN_PHONES_FILE):
+        self.path = path
+        self.capacity = capacity
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+        self._load()
+
+    @classmethod
+    def shared(cls) -> 'PhoneBloomFilter':
+        """Instância única por processo (carregada do disco uma vez)"""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'rb') as f:
+                content = f.read()
+            magic, num_hashes, num_bits, count = _HEADER.unpack_from(content)
+        except (OSError, struct.error):
+            return
+
+        if magic != _MAGIC or len(content) - _HEADER.size != (num_bits + 7) // 8:
+            print(f"   ⚠️  Filtro de telefones inválido em {self.path}, começando vazio")
+            return
+
+        # O arquivo manda no tamanho (pode ter sido criado com outra capacidade)
+        self.num_hashes, self.num_bits, self.count = num_hashes, num_bits, count
+        self.bits = bytearray(content[_HEADER.size:])
+
+    def save(self):
+        """Grava cabeçalho + bits (escrita atômica)"""
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, self.num_hashes, self.num_bits, self.count))
+            f.write(self.bits)
+        os.replace(tmp_path, self.path)
+
+    def _positions(self, phone: str):
+        digest = hashlib.blake2b(phone.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def __contains__(self, phone: str) -> bool:
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(phone))
+
+    def add(self, phone: str) -> bool:
+        """Insere o telefone; retorna True se ele era novo"""
+        new = False
+        for pos in self._positions(phone):
+            mask = 1 << (pos & 7)
+            if not self.bits[pos >> 3] & mask:
+                self.bits[pos >> 3] |= mask
+                new = True
+        if new:
+            self.count += 1
+        return new
+
+    def update(self, phones: Iterable[str]) -> int:
+        """Insere vários telefones; retorna quantos eram novos"""
+        return sum(1 for phone in phones if self.add(phone))
+
+    @property
+    def memory_bytes(self) -> int:
+        return len(self.bits)
+
+    def false_positive_rate(self) -> float:
+        """Taxa de falso positivo estimada para a ocupação atual"""
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+    def print_summary(self):
+        """Imprime ocupação, memória e falso positivo estimado"""
+        print(
+            f"\n🧠 Telefones conhecidos: {self.count} "
+            f"({self.memory_bytes / 1024:.0f} KB, {self.num_hashes} hashes, "
+            f"falso positivo estimado {self.false_positive_rate():.3%})"
+        )
+        if self.count > self.capacity:
+            print(f"   ⚠️  Acima da capacidade ({self.capacity}): aumente KNOWN_PHONES_CAPACITY")
@@ -2,24 +2,37 @@
 """
 Script principal para orquestrar execução completa do scraper Google Maps
 Meta: 100 profissionais/dia (5 cidades × 20 profissionais)
+
+Subcomandos:
+    scrape   Coleta as cidades do dia e envia resultados (padrão)
+    parse    Reextrai profissionais de HTML salvo (scrape --save-html)
+    deliver  Reenvia um arquivo de resultados existente para o Telegram
+    plan     Mostra o cronograma de cidades
+    bench    Executa benchmarks locais
+    tune     Ajusta pacing/timeouts contra um alvo simulado e grava um perfil
+
+Módulos pesados (Playwright, requests, scraper) são importados apenas
+pelo subcomando que precisa deles.
 """
 import os
 import sys
-import asyncio
-import random
-import json
-from datetime import datetime, date
-from typing import List, Dict
+import argparse
+import itertools
+from datetime import datetime
+from typing import Iterable, Optional, Tuple, TYPE_CHECKING
 
 # Adicionar src ao path se necessário
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from proxy_manager import ProxyManager
-from telegram_bot import TelegramBot
-from cities import get_daily_cities  # MUDANÇA: diário ao invés de semanal
-from scraper import scrape_city_wrapper
+from cities import get_daily_cities, get_all_cities  # MUDANÇA: diário ao invés de semanal
+from exporters import EXPORTERS
 import config
 
+if TYPE_CHECKING:
+    from exporters import Exporter
+    from postprocess import Stats
+    from professional import Professional
+
 
 def load_environment():
     """Carrega variáveis de ambiente necessárias"""
@@ -47,85 +60,53 @@ def load_environment():
     return True
 
 
-def remove_duplicates(professionals: List[Dict]) -> List[Dict]:
-    """
-    Remove profissionais duplicados por telefone
-    
-    Args:
-        professionals: Lista de profissionais
-    
-    Returns:
-        Lista sem duplicatas
-    """
-    seen_phones = set()
-    unique_professionals = []
-    
-    for prof in professionals:
-        phone = prof.get('telefone', '')
-        if phone and phone not in seen_phones:
-            seen_phones.add(phone)
-            unique_professionals.append(prof)
-    
-    duplicates_removed = len(professionals) - len(unique_professionals)
-    if duplicates_removed > 0:
-        print(f"🔄 {duplicates_removed} duplicatas removidas")
-    
-    return unique_professionals
-
-
-def validate_professionals(professionals: List[Dict]) -> List[Dict]:
-    """
-    Valida e filtra profissionais com campos obrigatórios
-    
-    Args:
-        professionals: Lista de profissionais
-    
-    Returns:
-        Lista apenas com profissionais válidos
-    """
-    valid = []
-    
-    for prof in professionals:
-        # Verificar campos obrigatórios
-        if all(prof.get(field) for field in config.REQUIRED_FIELDS):
-            valid.append(prof)
-    
-    invalid_count = len(professionals) - len(valid)
-    if invalid_count > 0:
-        print(f"⚠️  {invalid_count} profissionais inválidos removidos")
-    
-    return valid
-
-
-def save_results_locally(professionals: List[Dict], output_dir: str = "output/results"):
+def post_process(records: Iterable['Professional'], output_dir: str = "output/results",
+                 export_format: str = config.EXPORT_FORMAT,
+                 known_phones=None) -> Tuple[Optional['Exporter'], 'Stats']:
     """
-    Salva resultados em arquivo JSON local
+    Normaliza, valida, remove duplicatas e exporta em uma única passada
     
     Args:
-        professionals: Lista de profissionais
+        records: Profissionais (qualquer iterável; não é copiado)
         output_dir: Diretório de saída
+        export_format: Formato do arquivo (json, csv, parquet, sqlite)
+        known_phones: Filtro de telefones conhecidos a atualizar (salvo após exportar)
     
     Returns:
-        Caminho do arquivo salvo
+        Tupla (exportador finalizado ou None se nada sobrou, estatísticas)
     """
-    # Criar diretório se não existir
-    os.makedirs(output_dir, exist_ok=True)
+    from postprocess import ExportSink, PostProcessor, default_stages
     
-    # Nome do arquivo com timestamp
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"guincho_{timestamp}.json"
-    filepath = os.path.join(output_dir, filename)
+    processor = PostProcessor(default_stages(known_phones), sink=ExportSink(export_format, output_dir))
+    exporter = processor.run(records)
+    processor.print_report()
     
-    # Salvar JSON
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(professionals, f, indent=2, ensure_ascii=False)
+    if exporter and known_phones is not None:
+        known_phones.save()
     
-    print(f"💾 Resultados salvos: {filepath}")
-    return filepath
+    return exporter, processor.stats
 
 
-async def main():
-    """Função principal de execução"""
+async def run_scrape(export_format: str = config.EXPORT_FORMAT, use_pipeline: bool = False,
+                     html_archive_dir: str = None, backend: str = config.FETCH_BACKEND,
+                     progressive: bool = config.PROGRESSIVE_DELIVERY,
+                     hedge: bool = config.HEDGE_ENABLED,
+                     prefetch: bool = config.PREFETCH_BROWSER):
+    """Execução completa: scraping das cidades do dia + envio"""
+    from proxy_manager import ProxyManager
+    from telegram_bot import TelegramBot
+    from scraper import scrape_city_wrapper, fetch_city_html_wrapper, prepare_scraper
+    from pipeline import FetchParsePipeline
+    from network_stats import NetworkAccounting
+    from http_fetcher import HttpFetcher
+    from delivery import DeliveryQueue
+    from orchestrator import run_prefetching, run_sequential
+    from hedging import HedgePolicy, run_hedged
+    from known_phones import PhoneBloomFilter
+    from event_log import get_event_log
+    
+    log = get_event_log()
+    
     print("=" * 60)
     print("🗺️  SCRAPER GOOGLE MAPS - GUINCHO")
     print("=" * 60)
@@ -145,7 +126,8 @@ async def main():
         proxy_manager = ProxyManager()
         telegram_bot = TelegramBot()
     except Exception as e:
-        print(f"❌ Erro ao inicializar: {e}")
+        log.error("init.error", f"❌ Erro ao inicializar: {e}", error=str(e))
+        log.close()
         sys.exit(1)
     
     print()
@@ -160,50 +142,110 @@ async def main():
     print("=" * 60)
     
     # 4. Loop de scraping
-    all_professionals = []
-    successful_cities = 0
-    
-    for idx, (city, state) in enumerate(cities, 1):
-        print(f"\n[{idx}/{len(cities)}] ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+    network = NetworkAccounting()
+    http_fetcher = None
+    
+    if backend == "http":
+        if HttpFetcher.available():
+            http_fetcher = HttpFetcher()
+            log.info("backend.http", "⚡ Backend HTTP ativo (navegador apenas como fallback)")
+        else:
+            log.warning("backend.http_missing", "⚠️  httpx não instalado: usando apenas o navegador")
+    
+    # Entrega progressiva: cada cidade vai para o Telegram enquanto o scraping continua
+    delivery = None
+    if progressive:
+        delivery = DeliveryQueue(telegram_bot, export_format)
+        delivery.start()
+    
+    # Hedge: cidade lenta ganha segunda tentativa em outro proxy (p95 observado)
+    hedge_policy = None
+    if hedge:
+        if config.USE_PROXY and proxy_manager.get_total_proxies() >= 2:
+            hedge_policy = HedgePolicy()
+        else:
+            log.warning("hedge.disabled", "⚠️  Hedge desativado: precisa de pelo menos 2 proxies em uso")
+    
+    def hedged(wrapper):
+        if not hedge_policy:
+            return lambda city, state: wrapper(city, state, None)
+        return lambda city, state: run_hedged(
+            lambda on_ready: wrapper(city, state, on_ready), hedge_policy
+        )
+    
+    if use_pipeline:
+        # Fetch e parse em estágios separados (parse em processos próprios)
+        pipeline = FetchParsePipeline(
+            hedged(lambda city, state, on_ready: fetch_city_html_wrapper(
+                proxy_manager, city, state, html_archive_dir, network, http_fetcher, on_ready
+            )),
+            on_result=delivery.submit if delivery else None
+        )
+        results = await pipeline.run(cities)
+        
+        for (city, state), professionals in results.items():
+            network.add_records(network.city_key(city, state), len(professionals))
         
-        try:
-            # Scrape cidade
-            professionals = await scrape_city_wrapper(proxy_manager, city, state)
+        print()
+        pipeline.print_stats()
+    
+    elif prefetch and not http_fetcher:
+        # Próxima cidade (navegador + proxy) preparada durante o delay entre cidades
+        def scrape_prepared(city, state, scraper):
+            # Só a primeira tentativa usa o navegador preparado (o hedge sobe outro)
+            pending = [scraper]
             
-            if professionals:
-                all_professionals.extend(professionals)
-                successful_cities += 1
+            def attempt(city, state, on_ready):
+                return scrape_city_wrapper(
+                    proxy_manager, city, state, html_archive_dir, network, http_fetcher, on_ready,
+                    scraper=pending.pop() if pending else None
+                )
             
-            # Delay entre cidades (30-60s para evitar bloqueio do Google)
-            if idx < len(cities):
-                delay = random.uniform(config.DELAY_MIN, config.DELAY_MAX)
-                print(f"   ⏳ Aguardando {delay:.1f}s antes da próxima cidade...")
-                await asyncio.sleep(delay)
+            return hedged(attempt)(city, state)
+        
+        async def release(scraper):
+            await scraper.cleanup()
         
-        except Exception as e:
-            print(f"   ❌ Erro crítico na cidade: {e}")
-            continue
+        results = await run_prefetching(
+            cities,
+            scrape_prepared,
+            lambda city, state: prepare_scraper(proxy_manager, html_archive_dir, network),
+            release,
+            on_city=(lambda city, state, professionals: delivery.submit(professionals)) if delivery else None
+        )
     
-    print()
-    print("=" * 60)
-    print("📊 PROCESSAMENTO FINAL")
-    print("=" * 60)
+    else:
+        results = await run_sequential(
+            cities,
+            hedged(lambda city, state, on_ready: scrape_city_wrapper(
+                proxy_manager, city, state, html_archive_dir, network, http_fetcher, on_ready
+            )),
+            on_city=(lambda city, state, professionals: delivery.submit(professionals)) if delivery else None
+        )
+    
+    successful_cities = sum(1 for professionals in results.values() if professionals)
     
-    # 5. Pós-processamento
-    print(f"\n📋 Total bruto coletado: {len(all_professionals)} profissionais")
+    if http_fetcher:
+        await http_fetcher.close()
     
-    # Remover duplicatas
-    all_professionals = remove_duplicates(all_professionals)
-    print(f"📋 Após remover duplicatas: {len(all_professionals)}")
+    if hedge_policy:
+        hedge_policy.save()
     
-    # Validar dados
-    all_professionals = validate_professionals(all_professionals)
-    print(f"📋 Profissionais válidos: {len(all_professionals)}")
+    if delivery:
+        # Lotes restantes (normalmente já enviados durante o scraping)
+        await delivery.close()
     
-    # 6. Salvar localmente
     print()
-    if all_professionals:
-        save_results_locally(all_professionals)
+    print("=" * 60)
+    print("📊 PROCESSAMENTO FINAL")
+    print("=" * 60)
+    
+    # 5-6. Pós-processamento e arquivo local em uma única passada (ver postprocess.py)
+    known_phones = PhoneBloomFilter.shared()
+    exporter, stats = post_process(
+        itertools.chain.from_iterable(results.values()), export_format=export_format,
+        known_phones=known_phones
+    )
     
     # 7. Estatísticas
     print()
@@ -211,38 +253,58 @@ async def main():
     print("📈 ESTATÍSTICAS FINAIS")
     print("=" * 60)
     print(f"🏙️  Cidades processadas: {successful_cities}/{len(cities)}")
-    print(f"👥 Total de profissionais: {len(all_professionals)}")
+    print(f"👥 Total de profissionais: {stats.total}")
     
     if successful_cities > 0:
-        avg_per_city = len(all_professionals) / successful_cities
+        avg_per_city = stats.total / successful_cities
         print(f"📊 Média por cidade: {avg_per_city:.1f}")
     
-    # Distribuição por estado
-    states_count = {}
-    for prof in all_professionals:
-        state = prof.get('estado', 'N/A')
-        states_count[state] = states_count.get(state, 0) + 1
+    if stats.rated:
+        print(f"⭐ Com avaliação: {stats.rated} (média {stats.average_rating:.1f})")
     
-    if states_count:
+    # Distribuição por estado
+    if stats.by_state:
         print(f"\n🗺️  Distribuição por estado:")
-        for state, count in sorted(states_count.items(), key=lambda x: x[1], reverse=True)[:5]:
+        for state, count in stats.top_states(5):
             print(f"   {state}: {count} profissionais")
     
+    # Tráfego de rede (custo de proxy por profissional)
+    network.print_summary()
+    
+    if hedge_policy:
+        hedge_policy.print_summary()
+    
+    known_phones.print_summary()
+    
+    # Eventos da execução (JSONL completo em config.LOG_DIR)
+    log.close()
+    log.print_summary()
+    
     # 8. Enviar para Telegram
     print()
     print("=" * 60)
     print("📤 ENVIANDO RESULTADOS")
     print("=" * 60)
     
-    if all_professionals:
-        # Enviar arquivo JSON
-        success = telegram_bot.send_json_file(all_professionals)
+    if exporter:
+        if delivery and not delivery.failed_batches:
+            # Tudo já foi entregue em lotes durante o scraping
+            print(f"✅ {delivery.sent_records} profissionais entregues em {delivery.sent_batches} lotes")
+            success = True
+        else:
+            # Enviar arquivo exportado (formato escolhido na CLI)
+            success = telegram_bot.send_file(
+                exporter.path,
+                total=exporter.count,
+                cities_count=len(stats.cities),
+                mime_type=exporter.mime_type
+            )
         
         if success:
             # Enviar mensagem de resumo
             date_str = datetime.now().strftime("%d/%m/%Y")
             telegram_bot.send_summary_message(
-                total=len(all_professionals),
+                total=stats.total,
                 cities_count=successful_cities,
                 date=date_str
             )
@@ -261,10 +323,254 @@ async def main():
         return 1
 
 
+def cmd_scrape(args) -> int:
+    """Subcomando scrape"""
+    import asyncio
+    from clock import RealClock, set_clock
+    
+    if args.seed is not None:
+        # Delays sorteados reproduzíveis
+        set_clock(RealClock(seed=args.seed))
+    
+    html_archive_dir = config.HTML_ARCHIVE_DIR if args.save_html else None
+    return asyncio.run(run_scrape(
+        export_format=args.export_format,
+        use_pipeline=args.pipeline,
+        html_archive_dir=html_archive_dir,
+        backend=args.backend,
+        progressive=args.progressive,
+        hedge=args.hedge,
+        prefetch=args.prefetch,
+    ))
+
+
+def cmd_parse(args) -> int:
+    """Subcomando parse: reextrai profissionais de snapshots HTML"""
+    from result_parser import load_html_snapshot, parse_results_html
+    
+    paths = []
+    for path in args.paths:
+        if os.path.isdir(path):
+            paths.extend(
+                os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith(".html")
+            )
+        else:
+            paths.append(path)
+    
+    if not paths:
+        print("⚠️  Nenhum arquivo HTML encontrado")
+        return 1
+    
+    def parsed():
+        # Um arquivo por vez: o pós-processamento consome em fluxo
+        for path in paths:
+            try:
+                city, state, data_coleta, html_content = load_html_snapshot(path)
+            except (OSError, ValueError) as e:
+                print(f"   ❌ {path}: {e}")
+                continue
+            
+            city_name = city.replace("-", " ").title()
+            professionals = parse_results_html(html_content, city_name, state.upper(),
+                                               data_coleta=data_coleta)
+            print(f"   ✓ {city_name}/{state.upper()}: {len(professionals)} profissionais")
+            yield from professionals
+    
+    exporter, _ = post_process(parsed(), args.output_dir, args.export_format)
+    
+    if not exporter:
+        print("⚠️  Nenhum profissional extraído")
+        return 1
+    
+    return 0
+
+
+def cmd_deliver(args) -> int:
+    """Subcomando deliver: reenvia arquivo de resultados existente"""
+    from exporters import get_exporter_for_path, summarize_export
+    
+    if not os.path.isfile(args.file):
+        print(f"❌ Arquivo não encontrado: {args.file}")
+        return 1
+    
+    try:
+        exporter_cls = get_exporter_for_path(args.file)
+        total, cities_count = summarize_export(args.file)
+    except Exception as e:
+        print(f"❌ Não foi possível ler {args.file}: {e}")
+        return 1
+    
+    print(f"📦 {args.file}: {total} profissionais, {cities_count} cidades ({exporter_cls.format_name})")
+    
+    if args.dry_run:
+        return 0
+    
+    if not load_environment():
+        return 1
+    
+    from telegram_bot import TelegramBot
+    
+    telegram_bot = TelegramBot()
+    success = telegram_bot.send_file(args.file, total, cities_count, exporter_cls.mime_type)
+    return 0 if success else 1
+
+
+def cmd_plan(args) -> int:
+    """Subcomando plan: mostra o cronograma de cidades"""
+    if args.all:
+        for idx, (city, state) in enumerate(get_all_cities(), 1):
+            print(f"{idx:3d}. {city.replace('-', ' ').title()}/{state.upper()}")
+        return 0
+    
+    today = datetime.now().timetuple().tm_yday
+    for offset in range(args.days):
+        get_daily_cities(day_of_year=today + offset)
+        print()
+    return 0
+
+
+def cmd_bench(args) -> int:
+    """Subcomando bench: executa benchmarks locais"""
+    from bench import run_benchmarks
+    
+    run_benchmarks(args.only)
+    return 0
+
+
+def cmd_tune(args) -> int:
+    """Subcomando tune: varre parâmetros em tempo virtual e grava perfil recomendado"""
+    from tuner import SimulatedTarget, run_tuning
+    
+    target = SimulatedTarget(latency_median=args.latency, base_block_rate=args.block_rate)
+    recommendation = run_tuning(
+        target=target,
+        n_cities=args.cities,
+        seed=args.seed,
+        max_error_rate=args.max_error,
+        budget_minutes=args.budget_minutes,
+        profile_name=args.profile,
+    )
+    return 0 if recommendation else 1
+
+
+COMMANDS = ("scrape", "parse", "deliver", "plan", "bench", "tune")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Monta parser de linha de comando com subcomandos"""
+    parser = argparse.ArgumentParser(description="Scraper Google Search - Guincho")
+    subparsers = parser.add_subparsers(dest="command")
+    
+    scrape = subparsers.add_parser("scrape", help="Coleta as cidades do dia e envia resultados")
+    scrape.add_argument(
+        "--format",
+        dest="export_format",
+        choices=sorted(EXPORTERS),
+        default=config.EXPORT_FORMAT,
+        help="Formato do arquivo de resultados (também usado no anexo do Telegram)"
+    )
+    scrape.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Baixa cidades em paralelo e faz o parsing do HTML em processos separados"
+    )
+    scrape.add_argument(
+        "--save-html",
+        action="store_true",
+        help=f"Guarda o HTML de cada cidade em {config.HTML_ARCHIVE_DIR} (para o comando parse)"
+    )
+    scrape.add_argument(
+        "--backend",
+        choices=["browser", "http"],
+        default=config.FETCH_BACKEND,
+        help="http: busca via HTTP puro e só abre o navegador se a resposta não tiver resultados"
+    )
+    scrape.add_argument(
+        "--no-progressive",
+        dest="progressive",
+        action="store_false",
+        default=config.PROGRESSIVE_DELIVERY,
+        help="Envia um único arquivo no final em vez de lotes durante o scraping"
+    )
+    scrape.add_argument(
+        "--hedge",
+        action="store_true",
+        default=config.HEDGE_ENABLED,
+        help="Dispara segunda tentativa em outro proxy quando a página passa do p95 de latência"
+    )
+    scrape.add_argument(
+        "--no-prefetch",
+        dest="prefetch",
+        action="store_false",
+        default=config.PREFETCH_BROWSER,
+        help="Não prepara o navegador da próxima cidade durante o delay entre cidades"
+    )
+    scrape.add_argument("--seed", type=int, default=None,
+                        help="Semente dos delays aleatórios (execução reproduzível)")
+    scrape.set_defaults(handler=cmd_scrape)
+    
+    parse = subparsers.add_parser("parse", help="Reextrai profissionais de HTML salvo")
+    parse.add_argument("paths", nargs="*", default=[config.HTML_ARCHIVE_DIR],
+                       help="Arquivos .html ou diretórios (padrão: %(default)s)")
+    parse.add_argument("--format", dest="export_format", choices=sorted(EXPORTERS),
+                       default=config.EXPORT_FORMAT)
+    parse.add_argument("--output-dir", default="output/results")
+    parse.set_defaults(handler=cmd_parse)
+    
+    deliver = subparsers.add_parser("deliver", help="Reenvia arquivo de resultados para o Telegram")
+    deliver.add_argument("file", help="Arquivo exportado (.json, .csv, .parquet, .sqlite)")
+    deliver.add_argument("--dry-run", action="store_true", help="Só mostra o resumo, sem enviar")
+    deliver.set_defaults(handler=cmd_deliver)
+    
+    plan = subparsers.add_parser("plan", help="Mostra o cronograma de cidades")
+    plan.add_argument("--days", type=int, default=1, help="Quantidade de dias a partir de hoje")
+    plan.add_argument("--all", action="store_true", help="Lista todas as cidades da rotação")
+    plan.set_defaults(handler=cmd_plan)
+    
+    bench = subparsers.add_parser("bench", help="Executa benchmarks locais")
+    bench.add_argument("only", nargs="*", help="Benchmarks específicos (padrão: todos)")
+    bench.set_defaults(handler=cmd_bench)
+    
+    tune = subparsers.add_parser("tune", help="Ajusta pacing/timeouts contra um alvo simulado")
+    tune.add_argument("--cities", type=int, default=200, help="Cidades simuladas por combinação")
+    tune.add_argument("--seed", type=int, default=42, help="Semente da simulação")
+    tune.add_argument("--latency", type=float, default=8.0,
+                      help="Mediana da navegação no alvo simulado, em segundos")
+    tune.add_argument("--block-rate", type=float, default=0.02,
+                      help="Taxa base de bloqueio do alvo simulado")
+    tune.add_argument("--max-error", type=float, default=0.10,
+                      help="Taxa de erro máxima aceitável na recomendação")
+    tune.add_argument("--budget-minutes", type=float, default=150,
+                      help="Tempo disponível por execução (define MAX_CITIES_PER_DAY)")
+    tune.add_argument("--profile", default="tuned",
+                      help="Nome do perfil gravado em profiles/ (SCRAPER_PROFILE=<nome>)")
+    tune.set_defaults(handler=cmd_tune)
+    
+    return parser
+
+
+def main(argv=None) -> int:
+    """Ponto de entrada da CLI (sem subcomando = scrape)"""
+    parser = build_parser()
+    argv = list(sys.argv[1:] if argv is None else argv)
+    
+    # Compatibilidade: `python src/main.py [--format ...]` continua fazendo scrape
+    if not argv or (argv[0] not in COMMANDS and argv[0] not in ("-h", "--help")):
+        argv = ["scrape"] + argv
+    
+    args = parser.parse_args(argv)
+    
+    # Falha já na CLI, não depois de horas de scraping (export só roda no final)
+    export_format = getattr(args, "export_format", None)
+    if export_format and not EXPORTERS[export_format].available():
+        parser.error(f"formato {export_format} indisponível: instale pyarrow (pip install pyarrow)")
+    
+    return args.handler(args)
+
+
 if __name__ == "__main__":
     try:
-        exit_code = asyncio.run(main())
-        sys.exit(exit_code)
+        sys.exit(main())
     
     except KeyboardInterrupt:
         print("\n\n⚠️  Execução interrompida pelo usuário")
@@ -0,0 +1,189 @@
+"""
+Contabilidade de tráfego de rede por página, cidade, proxy e tipo de recurso
+
+Os proxies são cobrados por volume. Este módulo escuta os eventos
+requestfinished/requestfailed do contexto Playwright, soma bytes
+transferidos (headers + corpo, nos dois sentidos) e relaciona o total
+com a quantidade de profissionais coletados.
+"""
+import asyncio
+from typing import Dict, Optional
+
+import config
+
+
+class TrafficCounter:
+    """Requisições e bytes de um agrupamento"""
+
+    __slots__ = ('requests', 'failed', 'bytes_in', 'bytes_out')
+
+    def __init__(self):
+        self.requests = 0
+        self.failed = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    @property
+    def total_bytes(self) -> int:
+        return self.bytes_in + self.bytes_out
+
+    def add(self, bytes_in: int, bytes_out: int, failed: bool = False):
+        self.requests += 1
+        self.failed += int(failed)
+        self.bytes_in += max(0, bytes_in)
+        self.bytes_out += max(0, bytes_out)
+
+
+def format_bytes(size: float) -> str:
+    """Formata bytes em KB/MB legíveis"""
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.2f} GB"
+
+
+class NetworkAccounting:
+    """Acumula tráfego da execução inteira"""
+
+    def __init__(self):
+        self.by_page: Dict[str, TrafficCounter] = {}
+        self.by_city: Dict[str, TrafficCounter] = {}
+        self.by_proxy: Dict[str, TrafficCounter] = {}
+        self.by_resource_type: Dict[str, TrafficCounter] = {}
+        self.records_by_city: Dict[str, int] = {}
+        self.path_by_city: Dict[str, str] = {}  # 'http' ou 'browser'
+        self._pending = set()
+
+    @staticmethod
+    def city_key(city: str, state: str) -> str:
+        """Chave de agrupamento da cidade (ex: 'Sao Paulo/SP')"""
+        return f"{city.replace('-', ' ').title()}/{state.upper()}"
+
+    def record(self, city: str, proxy: str, resource_type: str, page: str,
+               bytes_in: int, bytes_out: int, failed: bool = False):
+        """Registra uma requisição em todos os agrupamentos"""
+        for table, key in (
+            (self.by_page, page),
+            (self.by_city, city),
+            (self.by_proxy, proxy),
+            (self.by_resource_type, resource_type),
+        ):
+            counter = table.get(key)
+            if counter is None:
+                counter = table[key] = TrafficCounter()
+            counter.add(bytes_in, bytes_out, failed)
+
+    def add_records(self, city: str, count: int):
+        """Informa quantos profissionais a cidade rendeu"""
+        self.records_by_city[city] = self.records_by_city.get(city, 0) + count
+
+    def record_path(self, city: str, path: str):
+        """Registra qual backend serviu a cidade"""
+        self.path_by_city[city] = path
+
+    def attach(self, context, city: str, proxy: str):
+        """
+        Passa a contabilizar as requisições de um contexto Playwright
+
+        Deve ser chamado antes da navegação da cidade.
+        """
+        page_labels = {}
+
+        def page_label(request) -> str:
+            try:
+                page = request.frame.page
+            except Exception:
+                return city
+            if page not in page_labels:
+                page_labels[page] = f"{city}#{len(page_labels) + 1}"
+            return page_labels[page]
+
+        async def on_finished(request):
+            try:
+                sizes = await request.sizes()
+            except Exception:
+                sizes = {}
+            self.record(
+                city, proxy, request.resource_type, page_label(request),
+                sizes.get('responseHeadersSize', 0) + sizes.get('responseBodySize', 0),
+                sizes.get('requestHeadersSize', 0) + sizes.get('requestBodySize', 0),
+            )
+
+        def on_failed(request):
+            self.record(city, proxy, request.resource_type, page_label(request), 0, 0, failed=True)
+
+        def schedule(request):
+            # sizes() é assíncrono: guardar a tarefa para aguardar em flush()
+            task = asyncio.ensure_future(on_finished(request))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+        context.on('requestfinished', schedule)
+        context.on('requestfailed', on_failed)
+
+    async def flush(self):
+        """Aguarda as medições pendentes (chamar antes de fechar o contexto)"""
+        if self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+
+    @property
+    def total(self) -> TrafficCounter:
+        total = TrafficCounter()
+        for counter in self.by_city.values():
+            total.requests += counter.requests
+            total.failed += counter.failed
+            total.bytes_in += counter.bytes_in
+            total.bytes_out += counter.bytes_out
+        return total
+
+    def bytes_per_record(self, city: Optional[str] = None) -> Optional[float]:
+        """Bytes transferidos por profissional coletado (None se nenhum)"""
+        if city is None:
+            records = sum(self.records_by_city.values())
+            total_bytes = self.total.total_bytes
+        else:
+            records = self.records_by_city.get(city, 0)
+            counter = self.by_city.get(city)
+            total_bytes = counter.total_bytes if counter else 0
+        return total_bytes / records if records else None
+
+    def print_summary(self):
+        """Imprime resumo de tráfego no relatório final"""
+        if self.path_by_city:
+            paths = {}
+            for path in self.path_by_city.values():
+                paths[path] = paths.get(path, 0) + 1
+            print(f"\n🛣️  Backend por cidade: " + ", ".join(f"{path}: {n}" for path, n in sorted(paths.items())))
+
+        total = self.total
+        if not total.requests:
+            return
+
+        print(f"\n📶 Tráfego de rede: {format_bytes(total.total_bytes)} em {total.requests} requisições"
+              f" ({total.failed} falhas)")
+
+        per_record = self.bytes_per_record()
+        if per_record is not None:
+            line = f"   Por profissional: {format_bytes(per_record)}"
+            if config.PROXY_COST_PER_GB:
+                cost = per_record / 1024 ** 3 * config.PROXY_COST_PER_GB
+                line += f" (≈ ${cost:.5f})"
+            print(line)
+
+        if self.by_page:
+            print(f"   Páginas: {len(self.by_page)}, média {format_bytes(total.total_bytes / len(self.by_page))}/página")
+
+        print("   Por cidade:")
+        for city, counter in sorted(self.by_city.items(), key=lambda x: x[1].total_bytes, reverse=True):
+            city_per_record = self.bytes_per_record(city)
+            suffix = f", {format_bytes(city_per_record)}/prof." if city_per_record else ""
+            print(f"      {city}: {format_bytes(counter.total_bytes)}, {counter.requests} req{suffix}")
+
+        print("   Por proxy:")
+        for proxy, counter in sorted(self.by_proxy.items(), key=lambda x: x[1].total_bytes, reverse=True):
+            print(f"      {proxy}: {format_bytes(counter.total_bytes)}, {counter.requests} req")
+
+        print("   Por tipo de recurso:")
+        for resource_type, counter in sorted(self.by_resource_type.items(), key=lambda x: x[1].total_bytes, reverse=True):
+            print(f"      {resource_type}: {format_bytes(counter.total_bytes)}, {counter.requests} req")
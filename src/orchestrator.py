@@ -0,0 +1,155 @@
+"""
+Orquestração do cronograma de cidades
+
+Percorre as cidades em sequência, com o delay aleatório entre cidades
+medido no relógio injetável (ver clock.py). Com VirtualClock, o mesmo
+código simula um dia inteiro em segundos.
+
+run_prefetching usa o delay entre cidades para preparar a próxima
+(navegador, proxy, checagens), deixando no caminho crítico só navegação
+e extração.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import config
+from clock import Clock, get_clock
+from event_log import get_event_log
+from professional import Professional
+
+
+ScrapeFn = Callable[[str, str], Awaitable[List[Professional]]]
+PreparedScrapeFn = Callable[[str, str, Optional[Any]], Awaitable[List[Professional]]]
+PrepareFn = Callable[[str, str], Awaitable[Any]]
+ReleaseFn = Callable[[Any], Awaitable[None]]
+CityCallback = Callable[[str, str, List[Professional]], None]
+
+
+async def run_sequential(
+    cities: List[Tuple[str, str]],
+    scrape_one: ScrapeFn,
+    on_city: Optional[CityCallback] = None,
+    clock: Optional[Clock] = None,
+) -> Dict[Tuple[str, str], List[Professional]]:
+    """
+    Processa as cidades uma a uma com DELAY_MIN..DELAY_MAX entre elas
+
+    Args:
+        cities: Lista de (cidade, uf)
+        scrape_one: Corrotina que coleta uma cidade
+        on_city: Callback chamado com o resultado de cada cidade
+        clock: Relógio para os delays (padrão: relógio corrente)
+
+    Returns:
+        Profissionais por (cidade, uf); cidades com erro ficam com lista vazia
+    """
+    clock = clock or get_clock()
+    log = get_event_log()
+    results = {}
+
+    for idx, (city, state) in enumerate(cities, 1):
+        log.info("city.begin", f"\n[{idx}/{len(cities)}] ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━",
+                 index=idx, total=len(cities), city=city, state=state)
+
+        try:
+            # Scrape cidade
+            professionals = await scrape_one(city, state)
+            results[(city, state)] = professionals
+
+            if on_city:
+                on_city(city, state, professionals)
+
+        except Exception as e:
+            log.error("city.critical", f"   ❌ Erro crítico na cidade: {e}", city=city, state=state, error=str(e))
+            results[(city, state)] = []
+
+        # Delay entre cidades (30-60s para evitar bloqueio do Google)
+        if idx < len(cities):
+            delay = clock.uniform(config.DELAY_MIN, config.DELAY_MAX)
+            log.info("city.wait", f"   ⏳ Aguardando {delay:.1f}s antes da próxima cidade...",
+                     city=city, state=state, delay=round(delay, 3))
+            await clock.sleep(delay)
+
+    return results
+
+
+async def run_prefetching(
+    cities: List[Tuple[str, str]],
+    scrape_one: PreparedScrapeFn,
+    prepare: PrepareFn,
+    release: ReleaseFn,
+    on_city: Optional[CityCallback] = None,
+    clock: Optional[Clock] = None,
+) -> Dict[Tuple[str, str], List[Professional]]:
+    """
+    Igual a run_sequential, mas prepara a próxima cidade durante o delay
+
+    O recurso preparado (ex: navegador com proxy já aplicado) é passado para
+    scrape_one, que passa a ser dono dele. Se a preparação falhar, scrape_one
+    recebe None e inicializa no caminho crítico, como antes.
+
+    Args:
+        cities: Lista de (cidade, uf)
+        scrape_one: Corrotina (cidade, uf, preparado ou None) que coleta uma cidade
+        prepare: Corrotina que prepara a cidade (cidade, uf)
+        release: Libera um recurso preparado que não chegou a ser usado
+        on_city: Callback chamado com o resultado de cada cidade
+        clock: Relógio para os delays (padrão: relógio corrente)
+
+    Returns:
+        Profissionais por (cidade, uf); cidades com erro ficam com lista vazia
+    """
+    clock = clock or get_clock()
+    log = get_event_log()
+    results = {}
+    prefetch = None
+
+    try:
+        for idx, (city, state) in enumerate(cities, 1):
+            log.info("city.begin", f"\n[{idx}/{len(cities)}] ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━",
+                     index=idx, total=len(cities), city=city, state=state)
+
+            prepared = None
+            if prefetch is not None:
+                try:
+                    # Normalmente já terminou durante o delay
+                    prepared = await prefetch
+                    log.info("prefetch.ready", "   🔥 Navegador preparado durante a espera", city=city)
+                except Exception as e:
+                    log.warning("prefetch.failed", f"   ⚠️  Preparação antecipada falhou ({e}), inicializando agora",
+                                city=city, error=str(e))
+                prefetch = None
+
+            try:
+                # Scrape cidade (scrape_one assume o recurso preparado)
+                professionals = await scrape_one(city, state, prepared)
+                results[(city, state)] = professionals
+
+                if on_city:
+                    on_city(city, state, professionals)
+
+            except Exception as e:
+                log.error("city.critical", f"   ❌ Erro crítico na cidade: {e}", city=city, state=state, error=str(e))
+                results[(city, state)] = []
+
+            # Delay entre cidades, com a próxima sendo preparada em paralelo
+            if idx < len(cities):
+                next_city, next_state = cities[idx]
+                prefetch = asyncio.ensure_future(prepare(next_city, next_state))
+
+                delay = clock.uniform(config.DELAY_MIN, config.DELAY_MAX)
+                log.info("city.wait", f"   ⏳ Aguardando {delay:.1f}s antes da próxima cidade (preparando {next_city})...",
+                         city=city, state=state, delay=round(delay, 3), prefetch=next_city)
+                await clock.sleep(delay)
+
+    finally:
+        # Interrompido no meio do delay: não deixar navegador órfão
+        if prefetch is not None:
+            if not prefetch.done():
+                prefetch.cancel()
+            try:
+                await release(await prefetch)
+            except (Exception, asyncio.CancelledError):
+                pass
+
+    return results
@@ -0,0 +1,208 @@
+"""
+Pipeline fetch → parse com estágios independentes
+
+O estágio de fetch (assíncrono, Playwright) empurra o HTML das páginas para
+uma fila limitada; o estágio de parse consome a fila em um
+ProcessPoolExecutor, sem travar o event loop que controla o navegador.
+A fila cheia aplica backpressure no fetch.
+"""
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import config
+from clock import Clock, get_clock
+from event_log import get_event_log
+from professional import Professional
+from result_parser import parse_results_html
+
+
+# Sinaliza fim da fila para os consumidores
+_DONE = object()
+
+
+class StageStats:
+    """Contadores de throughput de um estágio"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.errors = 0
+        self.busy_seconds = 0.0      # Tempo trabalhando (soma entre workers)
+        self.blocked_seconds = 0.0   # Tempo esperando a fila (backpressure/ociosidade)
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        """Itens por segundo de relógio"""
+        return self.items / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self) -> Dict:
+        return {
+            "estagio": self.name,
+            "itens": self.items,
+            "erros": self.errors,
+            "ocupado_s": round(self.busy_seconds, 3),
+            "bloqueado_s": round(self.blocked_seconds, 3),
+            "itens_por_s": round(self.throughput, 3),
+        }
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name}: {self.items} itens, {self.errors} erros, "
+            f"{self.throughput:.2f}/s, ocupado {self.busy_seconds:.1f}s, "
+            f"bloqueado {self.blocked_seconds:.1f}s"
+        )
+
+
+class FetchParsePipeline:
+    """
+    Orquestra os estágios de fetch e parse com concorrência independente
+
+    Args:
+        fetch: Corrotina (cidade, uf) -> HTML ou None
+        fetch_concurrency: Cidades baixadas em paralelo
+        parse_workers: Processos de parsing
+        queue_size: Capacidade da fila entre os estágios
+        pace: Se True, cada worker de fetch espera DELAY_MIN..DELAY_MAX entre cidades
+        on_result: Callback chamado com os profissionais de cada cidade assim que parseada
+        clock: Relógio dos delays (padrão: relógio corrente)
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str, str], Awaitable[Optional[str]]],
+        fetch_concurrency: int = config.FETCH_CONCURRENCY,
+        parse_workers: int = config.PARSE_WORKERS,
+        queue_size: int = config.PARSE_QUEUE_SIZE,
+        pace: bool = True,
+        on_result: Optional[Callable[[List[Professional]], None]] = None,
+        clock: Optional[Clock] = None,
+    ):
+        self.fetch = fetch
+        self.fetch_concurrency = max(1, fetch_concurrency)
+        self.parse_workers = max(1, parse_workers)
+        self.queue_size = max(1, queue_size)
+        self.pace = pace
+        self.on_result = on_result
+        self.clock = clock or get_clock()
+        self.fetch_stats = StageStats("fetch")
+        self.parse_stats = StageStats("parse")
+
+    async def run(self, cities: List[Tuple[str, str]]) -> Dict[Tuple[str, str], List[Professional]]:
+        """
+        Processa as cidades e retorna profissionais por (cidade, uf)
+
+        Cidades que falharam no fetch ou no parse aparecem com lista vazia.
+        """
+        pending: asyncio.Queue = asyncio.Queue()
+        for city in cities:
+            pending.put_nowait(city)
+
+        html_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        results = {city: [] for city in cities}
+
+        loop = asyncio.get_running_loop()
+        self.fetch_stats.started_at = self.parse_stats.started_at = time.perf_counter()
+
+        with ProcessPoolExecutor(max_workers=self.parse_workers) as pool:
+            fetchers = [
+                asyncio.create_task(self._fetch_worker(pending, html_queue))
+                for _ in range(self.fetch_concurrency)
+            ]
+            parsers = [
+                asyncio.create_task(self._parse_worker(loop, pool, html_queue, results))
+                for _ in range(self.parse_workers)
+            ]
+
+            try:
+                await asyncio.gather(*fetchers)
+                self.fetch_stats.finished_at = time.perf_counter()
+
+                for _ in parsers:
+                    await html_queue.put(_DONE)
+                await asyncio.gather(*parsers)
+                self.parse_stats.finished_at = time.perf_counter()
+            finally:
+                for task in fetchers + parsers:
+                    task.cancel()
+
+        return results
+
+    async def _fetch_worker(self, pending: asyncio.Queue, html_queue: asyncio.Queue):
+        first = True
+        while True:
+            try:
+                city, state = pending.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            # Delay entre cidades do mesmo worker (evitar bloqueio do Google)
+            if self.pace and not first:
+                delay = self.clock.uniform(config.DELAY_MIN, config.DELAY_MAX)
+                get_event_log().debug("city.wait", city=city, state=state, delay=round(delay, 3))
+                await self.clock.sleep(delay)
+            first = False
+
+            start = time.perf_counter()
+            try:
+                html_content = await self.fetch(city, state)
+            except Exception as e:
+                get_event_log().error("pipeline.fetch_error", f"   ❌ Erro no fetch de {city}: {e}",
+                                      city=city, state=state, error=str(e))
+                html_content = None
+            self.fetch_stats.busy_seconds += time.perf_counter() - start
+
+            if not html_content:
+                self.fetch_stats.errors += 1
+                continue
+
+            self.fetch_stats.items += 1
+
+            # Fila cheia = parse atrasado: fetch espera (backpressure)
+            start = time.perf_counter()
+            await html_queue.put((city, state, html_content))
+            self.fetch_stats.blocked_seconds += time.perf_counter() - start
+
+    async def _parse_worker(self, loop, pool, html_queue: asyncio.Queue, results: Dict):
+        while True:
+            start = time.perf_counter()
+            item = await html_queue.get()
+            self.parse_stats.blocked_seconds += time.perf_counter() - start
+
+            if item is _DONE:
+                return
+
+            city, state, html_content = item
+            city_name = city.replace("-", " ").title()
+
+            start = time.perf_counter()
+            try:
+                professionals = await loop.run_in_executor(
+                    pool, parse_results_html, html_content, city_name, state.upper()
+                )
+                results[(city, state)] = professionals
+                self.parse_stats.items += 1
+                if self.on_result and professionals:
+                    self.on_result(professionals)
+                get_event_log().info("pipeline.city_done", f"   ✅ {city_name}/{state.upper()}: {len(professionals)} profissionais",
+                                     city=city_name, state=state.upper(), total=len(professionals))
+            except Exception as e:
+                self.parse_stats.errors += 1
+                get_event_log().error("pipeline.parse_error", f"   ❌ Erro no parse de {city_name}: {e}",
+                                      city=city_name, state=state.upper(), error=str(e))
+            self.parse_stats.busy_seconds += time.perf_counter() - start
+
+    def print_stats(self):
+        """Imprime contadores por estágio"""
+        print(f"⚙️  Pipeline (fetch ×{self.fetch_concurrency}, parse ×{self.parse_workers}, fila {self.queue_size})")
+        print(f"   {self.fetch_stats}")
+        print(f"   {self.parse_stats}")
@@ -0,0 +1,242 @@
+"""
+Pós-processamento em fluxo: normalize → validate → dedupe → stats → sink
+
+Cada estágio é um gerador que recebe e devolve um iterável de registros,
+com trabalho O(1) por registro; nenhum estágio copia a lista. As
+estatísticas finais são acumuladas na mesma passada que alimenta o
+exportador, então a memória não cresce com o tamanho da saída (exceto o
+conjunto de telefones do dedupe).
+
+Estágios são plugáveis: qualquer objeto Stage (ou subclasse) pode entrar
+na lista passada ao PostProcessor.
+"""
+import itertools
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from exporters import Exporter, export_professionals
+from professional import Professional
+from result_parser import NON_DIGITS
+
+
+class Stage:
+    """Estágio do fluxo: conta entradas e saídas e transforma/filtra registros"""
+
+    name = "stage"
+
+    def __init__(self):
+        self.items_in = 0
+        self.items_out = 0
+
+    def process(self, prof: Professional) -> Optional[Professional]:
+        """Transforma um registro; None descarta"""
+        return prof
+
+    def __call__(self, records: Iterable[Professional]) -> Iterator[Professional]:
+        for prof in records:
+            self.items_in += 1
+            prof = self.process(prof)
+            if prof is not None:
+                self.items_out += 1
+                yield prof
+
+    @property
+    def dropped(self) -> int:
+        return self.items_in - self.items_out
+
+
+class Normalize(Stage):
+    """Espaços do nome e telefone só com dígitos (sem o +55)"""
+
+    name = "normalize"
+
+    def process(self, prof):
+        prof.nome = ' '.join(prof.nome.split())
+        phone = NON_DIGITS.sub('', prof.telefone)
+        if len(phone) in (12, 13) and phone.startswith('55'):
+            phone = phone[2:]
+        prof.telefone = phone
+        return prof
+
+
+class Validate(Stage):
+    """Descarta telefones fora do formato brasileiro (DDD + 8/9 dígitos)"""
+
+    name = "validate"
+
+    def __init__(self):
+        super().__init__()
+        self.reasons: Dict[str, int] = {}
+
+    def process(self, prof):
+        reason = self.check(prof)
+        if reason:
+            self.reasons[reason] = self.reasons.get(reason, 0) + 1
+            return None
+        return prof
+
+    @staticmethod
+    def check(prof: Professional) -> Optional[str]:
+        """Motivo da rejeição ou None se válido"""
+        phone = prof.telefone
+        if not prof.nome:
+            return "sem nome"
+        if len(phone) not in (10, 11):
+            return "tamanho do telefone"
+        if phone[0] == '0' or phone[1] == '0':
+            return "DDD inválido"
+        if len(phone) == 11 and phone[2] != '9':
+            return "celular sem 9"
+        return None
+
+
+class Dedupe(Stage):
+    """Mantém o primeiro registro de cada chave (padrão: telefone)"""
+
+    name = "dedupe"
+
+    def __init__(self, key: Callable[[Professional], str] = lambda prof: prof.telefone):
+        super().__init__()
+        self.key = key
+        self._seen = set()
+
+    def process(self, prof):
+        key = self.key(prof)
+        if key in self._seen:
+            return None
+        self._seen.add(key)
+        return prof
+
+
+class RememberPhones(Stage):
+    """Registra os telefones no filtro de conhecidos (ver known_phones.py) e conta os novos"""
+
+    name = "remember"
+
+    def __init__(self, known_phones):
+        super().__init__()
+        self.known_phones = known_phones
+        self.new_phones = 0
+
+    def process(self, prof):
+        self.new_phones += self.known_phones.add(prof.telefone)
+        return prof
+
+
+class Stats(Stage):
+    """Estatísticas finais acumuladas na mesma passada"""
+
+    name = "stats"
+
+    def __init__(self):
+        super().__init__()
+        self.by_state: Dict[str, int] = {}
+        self.cities = set()
+        self.rated = 0
+        self.rating_sum = 0.0
+
+    def process(self, prof):
+        self.by_state[prof.estado] = self.by_state.get(prof.estado, 0) + 1
+        self.cities.add((prof.cidade, prof.estado))
+        if prof.avaliacao_nota is not None:
+            self.rated += 1
+            self.rating_sum += prof.avaliacao_nota
+        return prof
+
+    @property
+    def total(self) -> int:
+        return self.items_out
+
+    @property
+    def average_rating(self) -> Optional[float]:
+        return self.rating_sum / self.rated if self.rated else None
+
+    def top_states(self, n: int = 5) -> List:
+        return sorted(self.by_state.items(), key=lambda x: x[1], reverse=True)[:n]
+
+
+class ExportSink:
+    """Destino final: exporta em fluxo; não cria arquivo se nada chegar"""
+
+    def __init__(self, export_format: str, output_dir: str = "output/results", prefix: str = "guincho"):
+        self.export_format = export_format
+        self.output_dir = output_dir
+        self.prefix = prefix
+
+    def __call__(self, records: Iterable[Professional]) -> Optional[Exporter]:
+        records = iter(records)
+        first = next(records, None)
+        if first is None:
+            return None
+
+        exporter = export_professionals(
+            itertools.chain((first,), records), self.export_format, self.output_dir, self.prefix
+        )
+        print(f"💾 Resultados salvos: {exporter.path}")
+        return exporter
+
+
+def default_stages(known_phones=None) -> List[Stage]:
+    """normalize → validate → dedupe → [remember] → stats"""
+    stages = [Normalize(), Validate(), Dedupe()]
+    if known_phones is not None:
+        stages.append(RememberPhones(known_phones))
+    return stages + [Stats()]
+
+
+class PostProcessor:
+    """
+    Encadeia os estágios e entrega o fluxo ao sink
+
+    Args:
+        stages: Estágios em ordem (padrão: default_stages())
+        sink: Consumidor final (padrão: só percorre o fluxo)
+    """
+
+    def __init__(self, stages: Optional[List[Stage]] = None,
+                 sink: Optional[Callable[[Iterable[Professional]], object]] = None):
+        self.stages = default_stages() if stages is None else stages
+        self.sink = sink
+
+    def process(self, records: Iterable[Professional]) -> Iterator[Professional]:
+        """Fluxo preguiçoso pelos estágios"""
+        for stage in self.stages:
+            records = stage(records)
+        return records
+
+    def run(self, records: Iterable[Professional]):
+        """Consome os registros numa única passada e retorna o resultado do sink"""
+        stream = self.process(records)
+        if self.sink is None:
+            for _ in stream:
+                pass
+            return None
+        return self.sink(stream)
+
+    def stage(self, stage_type: type) -> Optional[Stage]:
+        """Primeiro estágio do tipo dado (ex: processor.stage(Stats))"""
+        return next((s for s in self.stages if isinstance(s, stage_type)), None)
+
+    @property
+    def stats(self) -> Optional[Stats]:
+        return self.stage(Stats)
+
+    def print_report(self):
+        """Resumo do pós-processamento (entradas, descartes por estágio)"""
+        if not self.stages:
+            return
+        print(f"📋 Total bruto coletado: {self.stages[0].items_in} profissionais")
+        for stage in self.stages:
+            if not stage.dropped:
+                continue
+            if isinstance(stage, Dedupe):
+                print(f"🔄 {stage.dropped} duplicatas removidas")
+            elif isinstance(stage, Validate):
+                reasons = ", ".join(f"{reason}: {count}" for reason, count in stage.reasons.items())
+                print(f"🚫 {stage.dropped} inválidos descartados ({reasons})")
+            else:
+                print(f"🚫 {stage.dropped} descartados em {stage.name}")
+        print(f"📋 Após pós-processamento: {self.stages[-1].items_out}")
+
+        remember = self.stage(RememberPhones)
+        if remember:
+            print(f"🆕 Telefones novos: {remember.new_phones}")
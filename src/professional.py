@@ -0,0 +1,100 @@
+"""
+Registro tipado de profissional com validação única e serialização rápida
+"""
+import sys
+from datetime import datetime
+from typing import Dict, Optional
+
+import config
+
+try:
+    import orjson  # Backend opcional (bem mais rápido que json)
+except ImportError:
+    orjson = None
+
+
+# Ordem dos campos = ordem das chaves no JSON de saída
+FIELDS = (
+    'nome',
+    'telefone',
+    'cidade',
+    'estado',
+    'categoria',
+    'avaliacao_nota',
+    'avaliacao_total',
+    'servicos_negociados',
+    'tempo_getninjas',
+    'url_perfil',
+    'data_coleta',
+)
+
+
+class Professional:
+    """
+    Profissional coletado (11 campos)
+
+    Usa __slots__ em vez de dict por registro e valida os campos
+    obrigatórios uma única vez, na construção.
+    """
+
+    __slots__ = FIELDS
+
+    def __init__(
+        self,
+        nome: str,
+        telefone: str,
+        cidade: str,
+        estado: str,
+        categoria: str = "Guincho",
+        avaliacao_nota: Optional[float] = None,
+        avaliacao_total: int = 0,
+        servicos_negociados: int = 0,
+        tempo_getninjas: str = "N/A",
+        url_perfil: str = "",
+        data_coleta: Optional[str] = None,
+    ):
+        # cidade/estado/categoria/tempo/data se repetem: strings internadas
+        self.nome = nome.strip()[:100] if nome else ""
+        self.telefone = telefone or ""
+        self.cidade = sys.intern(cidade)
+        self.estado = sys.intern(estado)
+        self.categoria = sys.intern(categoria)
+        self.avaliacao_nota = avaliacao_nota
+        self.avaliacao_total = avaliacao_total
+        self.servicos_negociados = servicos_negociados
+        self.tempo_getninjas = sys.intern(tempo_getninjas)
+        self.url_perfil = url_perfil or ""
+        self.data_coleta = sys.intern(
+            data_coleta or datetime.now().strftime(config.DATE_FORMAT)
+        )
+
+        # Validação única dos campos obrigatórios
+        for field in config.REQUIRED_FIELDS:
+            if not getattr(self, field):
+                raise ValueError(f"Campo obrigatório vazio: {field}")
+
+    @classmethod
+    def create(cls, **fields) -> Optional['Professional']:
+        """Cria o registro ou retorna None se os campos obrigatórios faltarem"""
+        try:
+            return cls(**fields)
+        except ValueError:
+            return None
+
+    def to_dict(self) -> Dict:
+        """Converte para dict com as 11 chaves na ordem padrão"""
+        return {field: getattr(self, field) for field in FIELDS}
+
+    def __reduce__(self):
+        # Reconstrói via __init__ ao desserializar (ex: vindo de outro processo),
+        # reinternando as strings repetidas
+        return (Professional, tuple(getattr(self, field) for field in FIELDS))
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Professional):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in FIELDS)
+
+    def __repr__(self) -> str:
+        return f"Professional(nome={self.nome!r}, telefone={self.telefone!r}, cidade={self.cidade!r})"
+
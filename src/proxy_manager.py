@@ -5,19 +5,22 @@ Suporta proxies com e sem autenticação
 import os
 from typing import List, Optional
 
+from event_log import get_event_log
+
 
 class ProxyManager:
     """Gerencia rotação de 11 proxies residenciais"""
     
     def __init__(self):
         """Inicializa carregando 11 proxies das variáveis de ambiente"""
+        self.log = get_event_log()
         self.proxies = self._load_proxies()
         self.current_index = 0
         
         if not self.proxies:
-            print("⚠️  AVISO: Nenhum proxy configurado!")
+            self.log.warning("proxy.none", "⚠️  AVISO: Nenhum proxy configurado!")
         else:
-            print(f"✅ {len(self.proxies)} proxies carregados")
+            self.log.info("proxy.loaded", f"✅ {len(self.proxies)} proxies carregados", total=len(self.proxies))
     
     def _load_proxies(self) -> List[str]:
         """
@@ -40,11 +43,11 @@ class ProxyManager:
                 
                 if normalized:
                     proxies.append(normalized)
-                    print(f"  ✓ {proxy_key} carregado")
+                    self.log.debug("proxy.slot", f"  ✓ {proxy_key} carregado", slot=proxy_key, status="ok")
                 else:
-                    print(f"  ✗ {proxy_key} formato inválido")
+                    self.log.warning("proxy.invalid", f"  ✗ {proxy_key} formato inválido", slot=proxy_key)
             else:
-                print(f"  - {proxy_key} não configurado")
+                self.log.debug("proxy.slot", f"  - {proxy_key} não configurado", slot=proxy_key, status="ausente")
         
         return proxies
     
@@ -78,6 +81,7 @@ class ProxyManager:
             return None
         
         proxy = self.proxies[self.current_index]
+        self.log.debug("proxy.rotate", index=self.current_index)
         self.current_index = (self.current_index + 1) % len(self.proxies)
         
         return proxy
@@ -112,7 +116,7 @@ class ProxyManager:
                 return {"server": proxy_url}
         
         except Exception as e:
-            print(f"❌ Erro ao processar proxy: {e}")
+            self.log.error("proxy.parse_error", f"❌ Erro ao processar proxy: {e}", error=str(e))
             return None
     
     def get_total_proxies(self) -> int:
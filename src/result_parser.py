@@ -0,0 +1,477 @@
+"""
+Parser de resultados do Google Search a partir do HTML bruto
+
+Funções puras (sem Playwright), usadas tanto pelo scraper quanto pelo
+estágio de parsing em processos separados (ver pipeline.py).
+"""
+import os
+import re
+from datetime import datetime
+from html.parser import HTMLParser
+from typing import Callable, Dict, List, Optional, Tuple
+
+import config
+from professional import Professional
+
+
+# Seletores para resultados orgânicos do Google (atualizados 2026)
+RESULT_SELECTORS = [
+    'div.g',                    # Seletor clássico
+    'div[data-sokoban-container]',
+    'div.Gx5Zad',
+    'div[jscontroller]',
+    'div.kvH3mc',               # Novo formato
+    'div.MjjYud',               # Outro formato
+]
+
+TITLE_SELECTORS = ['h3', 'div[role="heading"]', 'span[role="heading"]', 'div.BNeawe']
+
+# Bloco de empresas locais ("local pack") no topo da busca
+LOCAL_PACK_SELECTORS = [
+    'div.VkpGBb',               # Item do local pack
+    'div.rllt__details',        # Detalhes do item (formato compacto)
+    'div.cXedhc',
+]
+
+LOCAL_PACK_TITLE_SELECTORS = ['div.dbg0pd', 'span.OSrXXb']
+
+# Nota e total de avaliações: "4,7(123)", "4.7 ★★★★★ (1.234)"
+# O ")" não pode ser seguido de dígitos: "(12) 3333-4444" é DDD, não avaliações
+RATING_PATTERN = re.compile(
+    r'(?<![\d,.])([0-5][,.]\d)\s*[★☆]*\s*\(\s*(\d{1,3}(?:\.\d{3})*|\d+)\s*\)(?!\s*9?\d{4})'
+)
+
+# Padrões de telefone brasileiros
+PHONE_PATTERNS = [
+    re.compile(r'\(?\d{2}\)?\s?\d{4,5}[-\s]?\d{4}'),
+    re.compile(r'\d{2}\s?\d{4,5}[-\s]?\d{4}'),
+    re.compile(r'\d{10,11}'),
+]
+NON_DIGITS = re.compile(r'\D')
+
+# Elementos sem tag de fechamento
+VOID_TAGS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr',
+}
+
+# Elementos que quebram linha no inner_text
+BLOCK_TAGS = {'div', 'p', 'br', 'li', 'h1', 'h2', 'h3', 'h4', 'tr', 'section'}
+
+# Elementos cujo texto não aparece no inner_text
+SKIP_TAGS = {'script', 'style', 'noscript', 'template'}
+
+
+def extract_phone_from_text(text: str) -> Optional[str]:
+    """Extrai telefone de um texto"""
+    if not text:
+        return None
+
+    for pattern in PHONE_PATTERNS:
+        for match in pattern.findall(text):
+            phone = NON_DIGITS.sub('', match)
+            if len(phone) >= 10 and len(phone) <= 11:
+                if phone[:2].isdigit() and 11 <= int(phone[:2]) <= 99:
+                    return phone
+
+    return None
+
+
+def classify_category(text: str) -> str:
+    """Define a categoria do serviço a partir do texto do resultado"""
+    text_lower = text.lower()
+    if "reboque" in text_lower:
+        return "Guincho e Reboque"
+    elif "24" in text or "24h" in text_lower:
+        return "Guincho 24h"
+    return "Guincho"
+
+
+def extract_rating(text: str) -> Tuple[Optional[float], int]:
+    """
+    Extrai nota e total de avaliações de um item do local pack
+
+    Returns:
+        Tupla (nota, total); (None, 0) se não houver avaliação
+    """
+    match = RATING_PATTERN.search(text or "")
+    if not match:
+        return None, 0
+    return float(match.group(1).replace(',', '.')), int(match.group(2).replace('.', ''))
+
+
+def detect_block_page(html_content: str) -> Optional[str]:
+    """
+    Identifica páginas que não são de resultados
+
+    Returns:
+        'captcha', 'consent' ou None
+    """
+    if "detectado tráfego incomum" in html_content or "unusual traffic" in html_content:
+        return 'captcha'
+    if "Before you continue" in html_content or "Antes de continuar" in html_content:
+        return 'consent'
+    return None
+
+
+def build_professional(nome: Optional[str], full_text: str, url: str,
+                       city: str, state: str, local_pack: bool = False,
+                       data_coleta: Optional[str] = None) -> Optional[Professional]:
+    """
+    Monta registro a partir do texto de um resultado
+
+    Args:
+        local_pack: Se True, o texto é de um item do local pack (tem nota e avaliações)
+        data_coleta: Data da coleta (padrão: hoje; snapshots antigos passam a data do arquivo)
+
+    Returns:
+        Professional ou None se não houver nome/telefone
+    """
+    if not nome:
+        # Usar primeira linha do texto como nome
+        lines = full_text.split('\n')
+        nome = lines[0] if lines else None
+
+    if not nome:
+        return None
+
+    telefone = extract_phone_from_text(full_text)
+    if not telefone:
+        return None
+
+    avaliacao_nota, avaliacao_total = extract_rating(full_text) if local_pack else (None, 0)
+
+    return Professional.create(
+        nome=nome,
+        telefone=telefone,
+        cidade=city,
+        estado=state,
+        categoria=classify_category(full_text),
+        avaliacao_nota=avaliacao_nota,
+        avaliacao_total=avaliacao_total,
+        url_perfil=url or "",
+        data_coleta=data_coleta,
+    )
+
+
+def merge_professionals(*groups: List[Professional], max_results: int = None,
+                        is_known: Optional[Callable[[str], bool]] = None) -> List[Professional]:
+    """
+    Junta grupos de resultados (na ordem dada) sem repetir telefone
+
+    O local pack vem primeiro: seus registros têm nota e total de avaliações.
+    Com is_known, só telefones novos contam para max_results.
+    """
+    max_results = max_results or config.MAX_PROFESSIONALS_PER_CITY
+
+    seen_phones = set()
+    merged = []
+    new_count = 0
+    for group in groups:
+        for prof in group:
+            if prof.telefone in seen_phones:
+                continue
+            seen_phones.add(prof.telefone)
+            merged.append(prof)
+            if is_known is None or not is_known(prof.telefone):
+                new_count += 1
+            if new_count >= max_results:
+                return merged
+
+    return merged
+
+
+def _compile_selector(selector: str):
+    """
+    Converte seletor CSS simples em (tag, atributo, valor)
+
+    Suporta apenas as formas usadas aqui: tag, tag.classe, tag[attr]
+    e tag[attr="valor"].
+    """
+    match = re.fullmatch(r'(\w+)(?:\.([\w-]+)|\[([\w-]+)(?:="([^"]*)")?\])?', selector)
+    if not match:
+        raise ValueError(f"Seletor não suportado: {selector}")
+
+    tag, css_class, attr, value = match.groups()
+    if css_class:
+        return tag, 'class', css_class
+    return tag, attr, value
+
+
+def _matches(compiled, tag: str, attrs: Dict[str, str]) -> bool:
+    sel_tag, attr, value = compiled
+    if tag != sel_tag:
+        return False
+    if attr is None:
+        return True
+    if attr not in attrs:
+        return False
+    if attr == 'class':
+        return value in (attrs['class'] or '').split()
+    return value is None or attrs[attr] == value
+
+
+class _Block:
+    """Texto, título e primeiro link de um bloco de resultado"""
+
+    __slots__ = ('text', 'title', 'title_depth', 'href')
+
+    def __init__(self):
+        self.text = []
+        self.title = None
+        self.title_depth = None
+        self.href = None
+
+
+class ResultBlockParser(HTMLParser):
+    """Coleta blocos de resultado para vários seletores em uma única passada"""
+
+    def __init__(self, selectors: List[str] = None, title_selectors: List[str] = None):
+        super().__init__(convert_charrefs=True)
+        self.selectors = selectors or RESULT_SELECTORS + LOCAL_PACK_SELECTORS
+        self._compiled = [(sel, _compile_selector(sel)) for sel in self.selectors]
+        self._title_compiled = [
+            _compile_selector(sel) for sel in title_selectors or TITLE_SELECTORS + LOCAL_PACK_TITLE_SELECTORS
+        ]
+        self.blocks: Dict[str, List[_Block]] = {sel: [] for sel in self.selectors}
+        self.div_count = 0
+        # Pilha de (tag, blocos abertos neste elemento)
+        self._stack = []
+        self._open: List[_Block] = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'div':
+            self.div_count += 1
+
+        if tag in BLOCK_TAGS:
+            self._add_text('\n')
+
+        if tag == 'a':
+            for block in self._open:
+                if block.href is None:
+                    block.href = attrs.get('href') or ""
+
+        if tag in VOID_TAGS:
+            return
+
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+
+        depth = len(self._stack)
+        for block in self._open:
+            if block.title is None and block.title_depth is None:
+                if any(_matches(c, tag, attrs) for c in self._title_compiled):
+                    block.title_depth = depth
+                    block.title = []
+
+        opened = []
+        for selector, compiled in self._compiled:
+            if _matches(compiled, tag, attrs):
+                block = _Block()
+                self.blocks[selector].append(block)
+                opened.append(block)
+
+        self._open.extend(opened)
+        self._stack.append((tag, opened))
+
+    def handle_endtag(self, tag):
+        # Tolera HTML mal formado: fecha até encontrar a tag correspondente
+        if not any(entry[0] == tag for entry in self._stack):
+            return
+
+        while self._stack:
+            open_tag, opened = self._stack.pop()
+            depth = len(self._stack)
+
+            if open_tag in SKIP_TAGS:
+                self._skip_depth -= 1
+
+            for block in self._open:
+                if block.title_depth == depth:
+                    block.title_depth = -1  # título concluído
+
+            for block in opened:
+                self._open.remove(block)
+
+            if open_tag == tag:
+                break
+
+        if tag in BLOCK_TAGS:
+            self._add_text('\n')
+
+    def handle_data(self, data):
+        self._add_text(data)
+
+    def _add_text(self, data: str):
+        if self._skip_depth:
+            return
+        for block in self._open:
+            block.text.append(data)
+            if block.title is not None and block.title_depth not in (None, -1):
+                block.title.append(data)
+
+
+def _normalize_text(parts: List[str]) -> str:
+    """Junta pedaços de texto no formato aproximado do inner_text"""
+    lines = (' '.join(line.split()) for line in ''.join(parts).split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+
+def _selector_pattern(selector: str) -> str:
+    """Regex aproximada da tag de abertura que casa com o seletor"""
+    tag, attr, value = _compile_selector(selector)
+    if attr is None:
+        return rf'<{tag}\b'
+    if attr == 'class':
+        return rf'<{tag}\b[^>]*\bclass=["\']?[^"\'>]*(?<![\w-]){re.escape(value)}(?![\w-])'
+    return rf'<{tag}\b[^>]*\b{re.escape(attr)}\b'
+
+
+# Seletores genéricos demais para a verificação rápida (quase toda página do Google tem)
+GENERIC_SELECTORS = {'div[jscontroller]'}
+
+RESULT_CONTAINER_RE = re.compile('|'.join(
+    _selector_pattern(sel) for sel in RESULT_SELECTORS + LOCAL_PACK_SELECTORS
+    if sel not in GENERIC_SELECTORS
+))
+
+
+def has_result_containers(html_content: str) -> bool:
+    """
+    Verificação rápida (regex, sem parsing) se a página tem contêineres de resultado
+
+    CAPTCHA, consentimento e páginas só com contêineres genéricos contam como falha.
+    """
+    if detect_block_page(html_content) is not None:
+        return False
+    return RESULT_CONTAINER_RE.search(html_content) is not None
+
+
+def _parse_blocks(html_content: str) -> Optional[ResultBlockParser]:
+    """Uma única passada no HTML (resultados orgânicos e local pack); None se for CAPTCHA"""
+    if detect_block_page(html_content) == 'captcha':
+        return None
+
+    parser = ResultBlockParser()
+    parser.feed(html_content)
+    parser.close()
+    return parser
+
+
+def _first_match(parser: Optional[ResultBlockParser],
+                 selectors: List[str]) -> Tuple[Optional[str], List[_Block]]:
+    """Primeiro seletor da cascata que encontrou blocos"""
+    if parser is None:
+        return None, []
+
+    for selector in selectors:
+        if parser.blocks[selector]:
+            return selector, parser.blocks[selector]
+
+    return None, []
+
+
+def professionals_from_blocks(blocks: List[_Block], city: str, state: str,
+                              max_results: int = None, local_pack: bool = False,
+                              is_known: Optional[Callable[[str], bool]] = None,
+                              data_coleta: Optional[str] = None) -> List[Professional]:
+    """
+    Converte blocos de resultado em profissionais válidos
+
+    Com is_known, só telefones novos contam para max_results (e até
+    MAX_ELEMENTS_PER_PAGE blocos da página podem ser lidos).
+    """
+    max_results = max_results or config.MAX_PROFESSIONALS_PER_CITY
+
+    professionals = []
+    new_count = 0
+    for block in (blocks[:config.MAX_ELEMENTS_PER_PAGE] if is_known else blocks[:max_results * 2]):
+        nome = _normalize_text(block.title) if block.title else None
+        prof = build_professional(nome, _normalize_text(block.text), block.href, city, state,
+                                  local_pack, data_coleta)
+        if prof:
+            professionals.append(prof)
+            if is_known is None or not is_known(prof.telefone):
+                new_count += 1
+            if new_count >= max_results:
+                break
+
+    return professionals
+
+
+def parse_results_html(html_content: str, city: str, state: str,
+                       max_results: int = None,
+                       is_known: Optional[Callable[[str], bool]] = None,
+                       data_coleta: Optional[str] = None) -> List[Professional]:
+    """
+    Extrai profissionais do HTML de uma página de resultados
+
+    Segue a mesma cascata de seletores do scraper: usa o primeiro seletor
+    que encontrar elementos. Os itens do local pack (lidos na mesma
+    passada) entram primeiro, sem repetir telefone.
+
+    Args:
+        html_content: HTML completo da página
+        city: Nome da cidade
+        state: UF
+        max_results: Limite de profissionais (padrão: MAX_PROFESSIONALS_PER_CITY)
+        is_known: Se dado, só telefones para os quais retorna False contam no limite
+        data_coleta: Data da coleta dos registros (padrão: hoje)
+
+    Returns:
+        Lista de profissionais válidos
+    """
+    parser = _parse_blocks(html_content)
+    _, local_blocks = _first_match(parser, LOCAL_PACK_SELECTORS)
+    _, blocks = _first_match(parser, RESULT_SELECTORS)
+
+    return merge_professionals(
+        professionals_from_blocks(local_blocks, city, state, max_results, local_pack=True,
+                                  is_known=is_known, data_coleta=data_coleta),
+        professionals_from_blocks(blocks, city, state, max_results, is_known=is_known,
+                                  data_coleta=data_coleta),
+        max_results=max_results,
+        is_known=is_known,
+    )
+
+
+def save_html_snapshot(html_content: str, city: str, state: str, output_dir: str) -> str:
+    """
+    Guarda o HTML bruto de uma cidade para reprocessamento posterior
+
+    Nome do arquivo: YYYYMMDD_<cidade-slug>_<uf>.html
+
+    Returns:
+        Caminho do arquivo salvo
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    date_str = datetime.now().strftime("%Y%m%d")
+    filepath = os.path.join(output_dir, f"{date_str}_{city}_{state.lower()}.html")
+
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(html_content)
+
+    return filepath
+
+
+def load_html_snapshot(filepath: str) -> Tuple[str, str, str, str]:
+    """
+    Lê HTML salvo por save_html_snapshot
+
+    Returns:
+        Tupla (cidade-slug, uf, data da coleta em DATE_FORMAT, html)
+
+    Raises:
+        ValueError: Se o nome do arquivo não seguir o padrão
+    """
+    name = os.path.splitext(os.path.basename(filepath))[0]
+    parts = name.split('_')
+    if len(parts) != 3:
+        raise ValueError(f"Nome de snapshot inválido: {os.path.basename(filepath)}")
+
+    date_str, city, state = parts
+    data_coleta = datetime.strptime(date_str, "%Y%m%d").strftime(config.DATE_FORMAT)
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return city, state, data_coleta, f.read()
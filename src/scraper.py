@@ -1,21 +1,85 @@
 """
 Scraper Google Search para profissionais de guincho
 """
-import asyncio
-import random
-import re
-from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Callable, List, Optional
 from playwright.async_api import async_playwright
 import config
+from clock import get_clock
+from event_log import get_event_log
 from proxy_manager import ProxyManager
+from professional import Professional
+from selector_cache import LAYOUT_PROBE_JS, SelectorCache
+from storage_state import StorageStateStore
+from network_stats import NetworkAccounting
+from known_phones import PhoneBloomFilter
+from http_fetcher import HttpFetcher
+from result_parser import (
+    LOCAL_PACK_SELECTORS, LOCAL_PACK_TITLE_SELECTORS, RESULT_SELECTORS, TITLE_SELECTORS,
+    build_professional, detect_block_page, has_result_containers, merge_professionals,
+    parse_results_html, save_html_snapshot,
+)
+
+
+def build_search_url(city_name: str, state: str, start: int = 0) -> str:
+    """Monta URL do Google Search para a cidade (start= para as páginas seguintes)"""
+    search_query = f"guincho {city_name} {state.upper()} telefone"
+    url = (
+        f"https://www.google.com/search?q={search_query.replace(' ', '+')}"
+        f"&num={config.RESULTS_PER_PAGE}&hl=pt-BR&gl=BR"
+    )
+    return f"{url}&start={start}" if start else url
+
+
+# Executado dentro da página: clica no primeiro botão de aceite e retorna seu texto
+CONSENT_ACCEPT_JS = """
+(words) => {
+    const candidates = document.querySelectorAll('button, [role="button"], input[type="submit"]');
+    for (const el of candidates) {
+        const text = (el.innerText || el.value || '').toLowerCase();
+        if (words.some(word => text.includes(word))) {
+            el.click();
+            return text.trim();
+        }
+    }
+    return null;
+}
+"""
+
+
+# Executado dentro da página: itens do local pack (primeiro seletor que encontrar algo)
+LOCAL_PACK_JS = """
+([selectors, titleSelectors]) => {
+    for (const selector of selectors) {
+        const items = document.querySelectorAll(selector);
+        if (!items.length) continue;
+        return Array.from(items).map(item => {
+            const title = titleSelectors.map(sel => item.querySelector(sel)).find(el => el);
+            const link = item.querySelector('a');
+            return {
+                nome: title ? title.innerText : null,
+                texto: item.innerText || '',
+                url: link ? (link.getAttribute('href') || '') : '',
+            };
+        });
+    }
+    return [];
+}
+"""
 
 
 class GoogleSearchScraper:
     """Scraper para Google Search usando Playwright"""
     
-    def __init__(self, proxy_manager: ProxyManager):
+    def __init__(self, proxy_manager: ProxyManager, html_archive_dir: Optional[str] = None,
+                 network: Optional[NetworkAccounting] = None):
         self.proxy_manager = proxy_manager
+        self.html_archive_dir = html_archive_dir  # Se definido, guarda HTML de cada cidade
+        self.network = network  # Se definido, contabiliza tráfego por cidade/proxy
+        self.selector_cache = SelectorCache.shared()
+        self.known_phones = PhoneBloomFilter.shared()
+        self.log = get_event_log()
+        self.storage_states = StorageStateStore()
+        self.identity = None
         self.browser = None
         self.context = None
         self.page = None
@@ -23,7 +87,8 @@ class GoogleSearchScraper:
     
     async def init_browser(self):
         """Inicializa navegador com proxy"""
-        proxy_config = None  # DESABILITADO TEMPORARIAMENTE PARA TESTE
+        proxy_config = self.proxy_manager.get_proxy_config() if config.USE_PROXY else None
+        self.identity = self.storage_states.identity(proxy_config)
         
         self.playwright = await async_playwright().start()
         
@@ -42,14 +107,37 @@ class GoogleSearchScraper:
         if proxy_config:
             context_options['proxy'] = proxy_config
         
+        # Reaproveitar cookies (consentimento) desta identidade de proxy
+        storage_state_path = self.storage_states.load(self.identity)
+        if storage_state_path:
+            context_options['storage_state'] = storage_state_path
+        
         self.context = await self.browser.new_context(**context_options)
         self.page = await self.context.new_page()
         
-        print(f"  🌐 Navegador iniciado {'com proxy' if proxy_config else 'sem proxy'}")
+        self.log.info(
+            "browser.start",
+            f"  🌐 Navegador iniciado {'com proxy' if proxy_config else 'sem proxy'}"
+            f"{' (sessão reaproveitada)' if storage_state_path else ''}",
+            proxy=self.identity, session_reused=bool(storage_state_path),
+        )
+    
+    async def check_ready(self):
+        """
+        Checagem rápida (sem rede) de que contexto e página respondem
+        
+        Raises:
+            RuntimeError: Se a página não estiver utilizável
+        """
+        state = await self.page.evaluate("() => document.readyState")
+        if state != 'complete':
+            raise RuntimeError(f"página em estado {state}")
     
     async def cleanup(self):
         """Fecha recursos"""
         try:
+            if self.network:
+                await self.network.flush()
             if self.page:
                 await self.page.close()
             if self.context:
@@ -59,216 +147,481 @@ class GoogleSearchScraper:
             if self.playwright:
                 await self.playwright.stop()
         except Exception as e:
-            print(f"   ⚠️  Erro ao fechar navegador: {e}")
+            self.log.warning("browser.cleanup_error", f"   ⚠️  Erro ao fechar navegador: {e}", error=str(e))
     
-    async def scrape_city(self, city: str, state: str) -> List[Dict]:
-        """Scrape profissionais de guincho em uma cidade via Google Search"""
+    async def scrape_city(self, city: str, state: str,
+                          on_ready: Optional[Callable[[], None]] = None) -> List[Professional]:
+        """
+        Scrape profissionais de guincho em uma cidade via Google Search
+        
+        Args:
+            on_ready: Chamado assim que a página de resultados carrega (usado pelo hedge)
+        """
         city_name = city.replace("-", " ").title()
         search_query = f"guincho {city_name} {state.upper()} telefone"
         
-        print(f"\n🏙️  Processando: {city_name}/{state.upper()}")
-        print(f"   🔍 Busca: \"{search_query}\"")
-        
         professionals = []
+        city_key = NetworkAccounting.city_key(city, state)
+        
+        self.log.info("city.start", f"\n🏙️  Processando: {city_name}/{state.upper()}", city=city_key, proxy=self.identity)
+        self.log.info("city.query", f"   🔍 Busca: \"{search_query}\"", city=city_key, query=search_query)
+        
+        if self.network:
+            self.network.attach(self.context, city_key, self.identity)
         
         try:
-            # 1. Construir URL do Google Search
-            search_url = f"https://www.google.com/search?q={search_query.replace(' ', '+')}&num=50&hl=pt-BR&gl=BR"
+            seen_phones = set()
+            new_count = 0
             
-            # 2. Navegar
-            await self.page.goto(search_url, wait_until='domcontentloaded', timeout=config.TIMEOUT_NAVIGATION)
-            await asyncio.sleep(random.uniform(3, 5))
+            for page_idx in range(config.MAX_PAGES_PER_CITY):
+                # 1. Construir URL do Google Search (start= a partir da 2ª página)
+                search_url = build_search_url(city_name, state, page_idx * config.RESULTS_PER_PAGE)
+                
+                # 2. Navegar
+                await self.page.goto(search_url, wait_until='domcontentloaded', timeout=config.TIMEOUT_NAVIGATION)
+                if on_ready and page_idx == 0:
+                    on_ready()
+                await get_clock().sleep(get_clock().uniform(3, 5))
+                
+                # 3. Extrair resultados (só telefones novos contam na cota)
+                page_results = await self._extract_results(
+                    city_name, state.upper(), seen_phones, config.MAX_PROFESSIONALS_PER_CITY - new_count
+                )
+                page_new = sum(1 for prof in page_results if prof.telefone not in self.known_phones)
+                professionals.extend(page_results)
+                new_count += page_new
+                
+                if page_idx == 0 and self.html_archive_dir:
+                    save_html_snapshot(await self.page.content(), city, state, self.html_archive_dir)
+                
+                if new_count >= config.MAX_PROFESSIONALS_PER_CITY or not page_results:
+                    break
+                
+                if not page_new:
+                    if page_idx + 1 < config.MAX_PAGES_PER_CITY:
+                        self.log.info(
+                            "city.paging_stop",
+                            f"   ⏹️  Página {page_idx + 1} sem telefones novos, parando a paginação",
+                            city=city_key, page=page_idx + 1,
+                        )
+                    break
+            
+            if professionals:
+                await self.storage_states.save(self.context, self.identity)
             
-            # 3. Extrair resultados
-            professionals = await self._extract_results(city_name, state.upper())
+            if self.network:
+                self.network.add_records(city_key, len(professionals))
             
-            print(f"   ✅ {len(professionals)} profissionais encontrados")
+            self.log.info(
+                "city.done", f"   ✅ {len(professionals)} profissionais encontrados ({new_count} novos)",
+                city=city_key, records=len(professionals), new=new_count,
+            )
         
         except Exception as e:
-            print(f"   ❌ Erro ao processar {city_name}: {e}")
+            self.log.error("city.error", f"   ❌ Erro ao processar {city_name}: {e}", city=city_key, error=str(e))
         
         return professionals
     
-    async def _extract_results(self, city: str, state: str) -> List[Dict]:
-        """Extrai dados dos resultados do Google Search"""
+    async def fetch_city_html(self, city: str, state: str,
+                              on_ready: Optional[Callable[[], None]] = None) -> Optional[str]:
+        """
+        Navega até a busca da cidade e retorna o HTML, sem extrair nada
+        
+        Usado pelo pipeline fetch → parse, onde o parsing roda em outro processo.
+        """
+        city_name = city.replace("-", " ").title()
+        self.log.info("fetch.start", f"\n🏙️  Baixando: {city_name}/{state.upper()}",
+                      city=city_name, state=state.upper(), proxy=self.identity)
+        
+        if self.network:
+            self.network.attach(self.context, NetworkAccounting.city_key(city, state), self.identity)
+        
+        try:
+            search_url = build_search_url(city_name, state)
+            await self.page.goto(search_url, wait_until='domcontentloaded', timeout=config.TIMEOUT_NAVIGATION)
+            if on_ready:
+                on_ready()
+            await get_clock().sleep(get_clock().uniform(3, 5))
+            
+            html_content = await self.page.content()
+            
+            block_page = detect_block_page(html_content)
+            
+            if block_page == 'consent':
+                await self._accept_consent()
+                html_content = await self.page.content()
+                block_page = detect_block_page(html_content)
+            
+            if block_page is None:
+                await self.storage_states.save(self.context, self.identity)
+            
+            if self.html_archive_dir:
+                save_html_snapshot(html_content, city, state, self.html_archive_dir)
+            
+            return html_content
+        
+        except Exception as e:
+            self.log.error("fetch.error", f"   ❌ Erro ao baixar {city_name}: {e}", city=city_name, error=str(e))
+            return None
+    
+    async def _accept_consent(self) -> bool:
+        """
+        Aceita a página de consentimento de cookies com uma única ação na página
+        
+        Returns:
+            True se um botão de aceite foi clicado
+        """
+        self.log.info("consent.detected", f"   🍪 Página de consentimento detectada, tentando aceitar...",
+                      proxy=self.identity)
+        try:
+            # Tentar clicar em "Aceitar tudo" ou "Accept all"
+            clicked = await self.page.evaluate(CONSENT_ACCEPT_JS, config.CONSENT_BUTTON_WORDS)
+            if not clicked:
+                return False
+            
+            # Esperar a página de resultados em vez de um sleep fixo
+            await self.page.wait_for_selector('#search, #rso', timeout=config.TIMEOUT_ELEMENT)
+            return True
+        except Exception:
+            return False
+    
+    async def _extract_results(self, city: str, state: str, seen_phones: Optional[set] = None,
+                               quota: Optional[int] = None) -> List[Professional]:
+        """
+        Extrai dados dos resultados do Google Search
+        
+        Args:
+            seen_phones: Telefones já extraídos desta cidade (páginas anteriores)
+            quota: Telefones novos (fora do filtro de conhecidos) a buscar nesta página
+        """
         professionals = []
+        seen_phones = set() if seen_phones is None else seen_phones
+        quota = quota or config.MAX_PROFESSIONALS_PER_CITY
+        new_count = 0
         
         try:
-            await asyncio.sleep(2)
+            await get_clock().sleep(2)
             
             # DEBUG: Verificar o que o Google retornou
             html_content = await self.page.content()
             
             # Verificar bloqueios
-            if "detectado tráfego incomum" in html_content or "unusual traffic" in html_content:
-                print(f"   🚫 CAPTCHA/Bloqueio detectado!")
+            block_page = detect_block_page(html_content)
+            
+            if block_page == 'captcha':
+                self.log.warning("extract.captcha", f"   🚫 CAPTCHA/Bloqueio detectado!", city=city, proxy=self.identity)
                 return []
             
-            if "Before you continue" in html_content or "Antes de continuar" in html_content:
-                print(f"   🍪 Página de consentimento detectada, tentando aceitar...")
-                try:
-                    # Tentar clicar em "Aceitar tudo" ou "Accept all"
-                    accept_buttons = await self.page.query_selector_all('button')
-                    for btn in accept_buttons:
-                        text = await btn.inner_text()
-                        if any(word in text.lower() for word in ['aceitar', 'accept', 'concordo', 'agree']):
-                            await btn.click()
-                            await asyncio.sleep(2)
-                            break
-                except:
-                    pass
+            if block_page == 'consent':
+                await self._accept_consent()
             
-            # Seletores para resultados orgânicos do Google (atualizados 2026)
-            result_selectors = [
-                'div.g',                    # Seletor clássico
-                'div[data-sokoban-container]',
-                'div.Gx5Zad',
-                'div[jscontroller]',
-                'div.kvH3mc',               # Novo formato
-                'div.MjjYud',               # Outro formato
-            ]
+            # Detecção do layout em uma única chamada dentro da página
+            layout = await self.page.evaluate(LAYOUT_PROBE_JS, RESULT_SELECTORS)
+            fingerprint = self.selector_cache.fingerprint(layout['fingerprint'])
+            selector = self.selector_cache.choose(layout['counts'], RESULT_SELECTORS)
             
-            results = []
-            for selector in result_selectors:
-                results = await self.page.query_selector_all(selector)
-                if len(results) > 0:
-                    print(f"   📋 Usando seletor: '{selector}' - {len(results)} elementos")
-                    break
+            previous = self.selector_cache.record(fingerprint, selector)
+            self.selector_cache.save()
             
-            if not results:
-                # DEBUG: Listar alguns elementos da página
-                print(f"   ⚠️  Nenhum resultado com seletores conhecidos")
-                print(f"   📄 Tamanho do HTML: {len(html_content)} chars")
-                
-                # Tentar encontrar qualquer div que pareça um resultado
-                all_divs = await self.page.query_selector_all('div')
-                print(f"   🔍 Total de divs na página: {len(all_divs)}")
-                return []
+            if previous:
+                self.log.warning(
+                    "extract.selector_changed",
+                    f"   ⚠️  Seletor vencedor mudou: '{previous}' → '{selector}' (layout {fingerprint})",
+                    previous=previous, selector=selector, layout=fingerprint,
+                )
             
-            print(f"   📋 {len(results)} resultados encontrados, extraindo até {config.MAX_PROFESSIONALS_PER_CITY}...")
+            # Local pack primeiro (tem nota e avaliações), lido em uma única chamada
+            for prof in await self._extract_local_pack(city, state):
+                if prof.telefone not in seen_phones:
+                    seen_phones.add(prof.telefone)
+                    professionals.append(prof)
+                    new_count += prof.telefone not in self.known_phones
             
-            # Limitar resultados
-            results_to_process = results[:config.MAX_PROFESSIONALS_PER_CITY * 2]
+            if not selector:
+                self.log.warning(
+                    "extract.no_selector",
+                    f"   ⚠️  Nenhum resultado com seletores conhecidos (layout {fingerprint}, "
+                    f"{len(html_content)} chars, {layout['divs']} divs)",
+                    city=city, layout=fingerprint, html_chars=len(html_content), divs=layout['divs'],
+                )
+                return professionals
             
-            for idx, result in enumerate(results_to_process, 1):
+            if new_count >= quota:
+                return professionals
+            
+            results = (await self.page.query_selector_all(selector))[:config.MAX_ELEMENTS_PER_PAGE]
+            self.log.info(
+                "extract.page",
+                f"   📋 Seletor '{selector}': {len(results)} resultados, extraindo até {quota} telefones novos...",
+                city=city, selector=selector, results=len(results), quota=quota,
+            )
+            
+            without_new = 0
+            for idx, result in enumerate(results, 1):
+                if without_new >= config.MAX_ELEMENTS_WITHOUT_NEW:
+                    # Página só com telefones conhecidos: não gastar o delay por elemento
+                    self.log.info(
+                        "extract.page_exhausted",
+                        f"   ⏭️  {without_new} telefones seguidos já conhecidos, encerrando a página",
+                        city=city, read=idx - 1,
+                    )
+                    break
+                
                 try:
                     # Extrair dados do resultado
                     prof_data = await self._extract_result_data(result, city, state)
                     
-                    if prof_data and self._validate_professional(prof_data):
+                    # Só resultados com telefone contam: sem telefone não diz nada sobre a página
+                    if prof_data and prof_data.telefone in seen_phones:
+                        without_new += 1
+                    
+                    if prof_data and prof_data.telefone not in seen_phones:
+                        seen_phones.add(prof_data.telefone)
                         professionals.append(prof_data)
-                        print(f"      ✓ {len(professionals)}. {prof_data['nome']} - {prof_data['telefone']}")
                         
-                        if len(professionals) >= config.MAX_PROFESSIONALS_PER_CITY:
+                        # Telefone já coletado em outro dia: entra no arquivo, não na cota
+                        known = prof_data.telefone in self.known_phones
+                        new_count += not known
+                        without_new = without_new + 1 if known else 0
+                        self.log.debug(
+                            "extract.record",
+                            f"      ✓ {len(professionals)}. {prof_data.nome} - {prof_data.telefone}{' (conhecido)' if known else ''}",
+                            city=city, nome=prof_data.nome, telefone=prof_data.telefone, known=known,
+                        )
+                        
+                        if new_count >= quota:
                             break
                     
-                    await asyncio.sleep(config.DELAY_BETWEEN_EXTRACTIONS)
+                    await get_clock().sleep(config.DELAY_BETWEEN_EXTRACTIONS)
                 
                 except Exception as e:
                     continue
         
         except Exception as e:
-            print(f"   ❌ Erro na extração: {e}")
+            self.log.error("extract.error", f"   ❌ Erro na extração: {e}", city=city, error=str(e))
         
         return professionals
     
-    async def _extract_result_data(self, result_element, city: str, state: str) -> Optional[Dict]:
+    async def _extract_local_pack(self, city: str, state: str) -> List[Professional]:
+        """Extrai empresas do local pack com nome, telefone, nota e avaliações"""
+        try:
+            items = await self.page.evaluate(LOCAL_PACK_JS, [LOCAL_PACK_SELECTORS, LOCAL_PACK_TITLE_SELECTORS])
+        except Exception as e:
+            self.log.warning("extract.local_pack_error", f"   ⚠️  Erro ao ler local pack: {e}", city=city, error=str(e))
+            return []
+        
+        professionals = merge_professionals([
+            prof for prof in (
+                build_professional(item['nome'], item['texto'], item['url'], city, state, local_pack=True)
+                for item in items
+            ) if prof
+        ])
+        
+        if professionals:
+            self.log.info(
+                "extract.local_pack", f"   📍 Local pack: {len(professionals)} empresas com telefone",
+                city=city, records=len(professionals),
+            )
+            for idx, prof in enumerate(professionals, 1):
+                self.log.debug(
+                    "extract.local_pack_record",
+                    f"      ✓ {idx}. {prof.nome} - {prof.telefone} ({prof.avaliacao_nota or '-'}★, {prof.avaliacao_total})",
+                    city=city, nome=prof.nome, telefone=prof.telefone,
+                    nota=prof.avaliacao_nota, avaliacoes=prof.avaliacao_total,
+                )
+        
+        return professionals
+    
+    async def _extract_result_data(self, result_element, city: str, state: str) -> Optional[Professional]:
         """Extrai dados de um resultado do Google Search"""
         try:
             # Pegar TODO o texto do elemento
             full_text = await result_element.inner_text()
             
             # Extrair título
-            title_selectors = ['h3', 'div[role="heading"]', 'span[role="heading"]', 'div.BNeawe']
             nome = None
-            for selector in title_selectors:
+            for selector in TITLE_SELECTORS:
                 title_el = await result_element.query_selector(selector)
                 if title_el:
                     nome = await title_el.inner_text()
                     break
             
-            if not nome:
-                # Usar primeira linha do texto como nome
-                lines = full_text.split('\n')
-                nome = lines[0] if lines else None
-            
-            if not nome:
-                return None
-            
-            # Buscar telefone no texto completo
-            telefone = self._extract_phone_from_text(full_text)
-            
-            if not telefone:
-                return None
-            
             # Extrair URL
             url = ""
             link_el = await result_element.query_selector('a')
             if link_el:
                 url = await link_el.get_attribute('href') or ""
             
-            # Categoria
-            categoria = "Guincho"
-            text_lower = full_text.lower()
-            if "reboque" in text_lower:
-                categoria = "Guincho e Reboque"
-            elif "24" in full_text or "24h" in text_lower:
-                categoria = "Guincho 24h"
-            
-            return {
-                "nome": nome.strip()[:100],  # Limitar tamanho
-                "telefone": telefone,
-                "cidade": city,
-                "estado": state,
-                "categoria": categoria,
-                "avaliacao_nota": None,
-                "avaliacao_total": 0,
-                "servicos_negociados": 0,
-                "tempo_getninjas": "N/A",
-                "url_perfil": url,
-                "data_coleta": datetime.now().strftime(config.DATE_FORMAT)
-            }
+            # Telefone, categoria e validação compartilhados com o parser de HTML
+            return build_professional(nome, full_text, url, city, state)
         
         except Exception as e:
             return None
     
-    def _extract_phone_from_text(self, text: str) -> Optional[str]:
-        """Extrai telefone de um texto"""
-        if not text:
-            return None
+
+async def fetch_search_html_http(http_fetcher: HttpFetcher, proxy_manager: ProxyManager,
+                                 city: str, state: str,
+                                 network: Optional[NetworkAccounting] = None) -> Optional[str]:
+    """
+    Caminho rápido: baixa a busca via HTTP, pelo mesmo proxy do navegador
+    
+    Returns:
+        HTML se a resposta tiver contêineres de resultado; None para cair no navegador
+    """
+    city_name = city.replace("-", " ").title()
+    city_key = NetworkAccounting.city_key(city, state)
+    proxy_config = proxy_manager.get_proxy_config() if config.USE_PROXY else None
+    log = get_event_log()
+    
+    try:
+        status, html_content, bytes_in = await http_fetcher.fetch(
+            build_search_url(city_name, state), proxy_config
+        )
+    except Exception as e:
+        log.warning("http.error", f"   ⚠️  HTTP falhou ({e}), usando navegador", city=city_key, error=str(e))
+        return None
+    
+    if network:
+        proxy = StorageStateStore.identity(proxy_config)
+        network.record(city_key, proxy, 'document', f"{city_key}#http", bytes_in, 0)
+    
+    if status != 200:
+        log.warning("http.status", f"   ⚠️  HTTP {status}, usando navegador", city=city_key, status=status)
+        return None
+    
+    if not has_result_containers(html_content):
+        log.warning("http.no_containers", f"   ⚠️  Resposta HTTP sem resultados reconhecíveis, usando navegador",
+                    city=city_key, block_page=detect_block_page(html_content))
+        return None
+    
+    return html_content
+
+
+async def scrape_city_wrapper(proxy_manager: ProxyManager, city: str, state: str,
+                              html_archive_dir: Optional[str] = None,
+                              network: Optional[NetworkAccounting] = None,
+                              http_fetcher: Optional[HttpFetcher] = None,
+                              on_ready: Optional[Callable[[], None]] = None,
+                              scraper: Optional[GoogleSearchScraper] = None) -> List[Professional]:
+    """
+    Wrapper para scraping de uma cidade
+    
+    Com http_fetcher, tenta primeiro o caminho HTTP e só abre o navegador
+    se a resposta não tiver os contêineres de resultado esperados.
+    on_ready é chamado quando a página de resultados fica pronta (ver hedging.py).
+    scraper: navegador já preparado (prepare_scraper); o wrapper passa a ser dono dele.
+    """
+    city_key = NetworkAccounting.city_key(city, state)
+    log = get_event_log()
+    
+    if scraper is not None and http_fetcher:
+        # Navegador só seria usado como fallback: não segurar recursos
+        await scraper.cleanup()
+        scraper = None
+    
+    if http_fetcher:
+        log.info("http.start", f"\n🏙️  Processando: {city_key} (HTTP)", city=city_key)
+        html_content = await fetch_search_html_http(http_fetcher, proxy_manager, city, state, network)
         
-        # Padrões de telefone brasileiros
-        patterns = [
-            r'\(?\d{2}\)?\s?\d{4,5}[-\s]?\d{4}',
-            r'\d{2}\s?\d{4,5}[-\s]?\d{4}',
-            r'\d{10,11}',
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text)
-            for match in matches:
-                phone = re.sub(r'\D', '', match)
-                if len(phone) >= 10 and len(phone) <= 11:
-                    if phone[:2].isdigit() and 11 <= int(phone[:2]) <= 99:
-                        return phone
+        professionals = []
+        if html_content is not None:
+            professionals = parse_results_html(
+                html_content, city.replace("-", " ").title(), state.upper(),
+                is_known=PhoneBloomFilter.shared().__contains__,
+            )
+            if not professionals:
+                # Página sem blocos de resultado aproveitáveis: o navegador tenta de novo
+                log.warning("http.empty", f"   ⚠️  Resposta HTTP sem profissionais, usando navegador", city=city_key)
         
-        return None
+        if professionals:
+            if on_ready:
+                on_ready()
+            log.info("http.done", f"   ✅ {len(professionals)} profissionais encontrados",
+                     city=city_key, total=len(professionals))
+            
+            if html_archive_dir:
+                save_html_snapshot(html_content, city, state, html_archive_dir)
+            if network:
+                network.add_records(city_key, len(professionals))
+                network.record_path(city_key, 'http')
+            return professionals
     
-    def _validate_professional(self, data: Dict) -> bool:
-        """Valida se tem campos obrigatórios"""
-        for field in config.REQUIRED_FIELDS:
-            if not data.get(field) or data.get(field) == "":
-                return False
-        return True
+    if network:
+        network.record_path(city_key, 'browser')
+    
+    prepared = scraper is not None
+    if not prepared:
+        scraper = GoogleSearchScraper(proxy_manager, html_archive_dir, network)
+    
+    try:
+        if not prepared:
+            await scraper.init_browser()
+        professionals = await scraper.scrape_city(city, state, on_ready)
+        return professionals
+    finally:
+        await scraper.cleanup()
 
 
-async def scrape_city_wrapper(proxy_manager: ProxyManager, city: str, state: str) -> List[Dict]:
-    """Wrapper para scraping de uma cidade"""
-    scraper = GoogleSearchScraper(proxy_manager)
+async def prepare_scraper(proxy_manager: ProxyManager, html_archive_dir: Optional[str] = None,
+                          network: Optional[NetworkAccounting] = None) -> GoogleSearchScraper:
+    """
+    Sobe navegador, contexto com o próximo proxy e página, e checa se respondem
     
+    Usado durante o delay entre cidades (orchestrator.run_prefetching).
+    
+    Raises:
+        Exception: Se algo falhar (recursos já fechados)
+    """
+    scraper = GoogleSearchScraper(proxy_manager, html_archive_dir, network)
     try:
         await scraper.init_browser()
-        professionals = await scraper.scrape_city(city, state)
-        return professionals
+        await scraper.check_ready()
+        return scraper
+    except BaseException:
+        await scraper.cleanup()
+        raise
+
+
+async def fetch_city_html_wrapper(proxy_manager: ProxyManager, city: str, state: str,
+                                  html_archive_dir: Optional[str] = None,
+                                  network: Optional[NetworkAccounting] = None,
+                                  http_fetcher: Optional[HttpFetcher] = None,
+                                  on_ready: Optional[Callable[[], None]] = None) -> Optional[str]:
+    """
+    Wrapper para baixar o HTML de uma cidade (HTTP se possível, senão navegador próprio)
+    
+    Mesma regra do scrape_city_wrapper: a resposta HTTP só é aceita se render
+    profissionais (o parse extra custa pouco perto da rede); senão, navegador.
+    """
+    city_key = NetworkAccounting.city_key(city, state)
+    
+    if http_fetcher:
+        html_content = await fetch_search_html_http(http_fetcher, proxy_manager, city, state, network)
+        
+        if html_content is not None and not parse_results_html(
+            html_content, city.replace("-", " ").title(), state.upper(),
+            is_known=PhoneBloomFilter.shared().__contains__,
+        ):
+            get_event_log().warning("http.empty", f"   ⚠️  Resposta HTTP sem profissionais, usando navegador",
+                                    city=city_key)
+            html_content = None
+        
+        if html_content is not None:
+            if on_ready:
+                on_ready()
+            if html_archive_dir:
+                save_html_snapshot(html_content, city, state, html_archive_dir)
+            if network:
+                network.record_path(city_key, 'http')
+            return html_content
+    
+    if network:
+        network.record_path(city_key, 'browser')
+    
+    scraper = GoogleSearchScraper(proxy_manager, html_archive_dir, network)
+    
+    try:
+        await scraper.init_browser()
+        return await scraper.fetch_city_html(city, state, on_ready)
     finally:
         await scraper.cleanup()
@@ -0,0 +1,109 @@
+"""
+Cache de seletores de resultado aprendido entre execuções
+
+Guarda, por "impressão digital" do layout da página, qual seletor da
+cascata funcionou por último e quantas vezes cada um venceu, para alertar
+quando o vencedor de um layout muda. A escolha segue sempre a ordem da
+cascata (o primeiro seletor com elementos na página). A detecção
+do layout é feita em uma única chamada dentro da página (LAYOUT_PROBE_JS),
+que devolve a impressão digital e a contagem de todos os candidatos.
+"""
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import config
+
+
+# Executado dentro da página: recebe a lista de seletores candidatos
+LAYOUT_PROBE_JS = """
+(selectors) => {
+    const root = document.querySelector('#rso') || document.querySelector('#search') || document.body;
+    const classes = new Set();
+    for (const child of root.children) {
+        for (const cls of child.classList) classes.add(cls);
+    }
+    const counts = {};
+    for (const selector of selectors) {
+        counts[selector] = document.querySelectorAll(selector).length;
+    }
+    return {
+        fingerprint: (root.id || root.tagName) + ':' + Array.from(classes).sort().join('.'),
+        counts: counts,
+        divs: document.getElementsByTagName('div').length,
+    };
+}
+"""
+
+
+class SelectorCache:
+    """Estatísticas de seletores vencedores por layout, persistidas em JSON"""
+
+    _shared = None
+
+    def __init__(self, path: str = config.SELECTOR_CACHE_FILE):
+        self.path = path
+        self.layouts: Dict[str, Dict] = {}
+        self._load()
+
+    @classmethod
+    def shared(cls) -> 'SelectorCache':
+        """Instância única por processo (carregada do disco uma vez)"""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.layouts = data.get('layouts', {})
+        except (OSError, ValueError) as e:
+            print(f"   ⚠️  Cache de seletores ignorado ({e})")
+
+    def save(self):
+        """Grava estatísticas no disco"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'layouts': self.layouts}, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def fingerprint(raw: str) -> str:
+        """Reduz a descrição do layout a um hash curto"""
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:12]
+
+    @staticmethod
+    def choose(counts: Dict[str, int], candidates: List[str]) -> Optional[str]:
+        """Retorna o primeiro seletor da cascata com elementos na página"""
+        for selector in candidates:
+            if counts.get(selector, 0) > 0:
+                return selector
+        return None
+
+    def record(self, fingerprint: str, selector: Optional[str]) -> Optional[str]:
+        """
+        Registra o resultado de uma detecção
+
+        Returns:
+            Seletor vencedor anterior, se o vencedor mudou (alerta de layout)
+        """
+        layout = self.layouts.setdefault(fingerprint, {'winner': None, 'hits': {}, 'misses': 0})
+        layout['updated'] = datetime.now().strftime(config.DATE_FORMAT)
+
+        if selector is None:
+            layout['misses'] = layout.get('misses', 0) + 1
+            return None
+
+        # Compara com o vencedor deste layout: layouts diferentes têm vencedores diferentes
+        previous = layout.get('winner')
+        layout['hits'][selector] = layout['hits'].get(selector, 0) + 1
+        layout['winner'] = selector
+        if previous and previous != selector:
+            return previous
+        return None
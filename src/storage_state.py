@@ -0,0 +1,90 @@
+"""
+Persistência de cookies/localStorage do navegador por identidade de proxy
+
+Cada proxy (ou conexão direta) tem seu próprio arquivo de storage state do
+Playwright. Reaproveitar o estado evita repetir a tela de consentimento do
+Google a cada cidade. A idade conta a partir da criação da sessão
+(gravada em <identidade>.created na primeira gravação), não da última
+gravação: sessões mais velhas que o limite são descartadas mesmo se o
+proxy for usado todo dia.
+"""
+import hashlib
+import os
+import time
+from typing import Optional
+
+import config
+
+
+class StorageStateStore:
+    """Arquivos de storage state por identidade, com expiração"""
+
+    def __init__(self, directory: str = config.STORAGE_STATE_DIR,
+                 max_age_hours: float = config.STORAGE_STATE_MAX_AGE_HOURS):
+        self.directory = directory
+        self.max_age_seconds = max_age_hours * 3600
+
+    @staticmethod
+    def identity(proxy_config: Optional[dict]) -> str:
+        """Identificador estável do proxy (sem expor credenciais no nome do arquivo)"""
+        if not proxy_config:
+            return "direto"
+        raw = f"{proxy_config.get('server', '')}|{proxy_config.get('username', '')}"
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:12]
+
+    def path_for(self, identity: str) -> str:
+        return os.path.join(self.directory, f"{identity}.json")
+
+    def created_path_for(self, identity: str) -> str:
+        return os.path.join(self.directory, f"{identity}.created")
+
+    def created_at(self, identity: str) -> Optional[float]:
+        """Instante de criação da sessão (sem marcador: mtime do estado)"""
+        try:
+            with open(self.created_path_for(identity), 'r', encoding='utf-8') as f:
+                return float(f.read().strip())
+        except (OSError, ValueError):
+            pass
+        try:
+            return os.path.getmtime(self.path_for(identity))
+        except OSError:
+            return None
+
+    def load(self, identity: str) -> Optional[str]:
+        """
+        Retorna caminho do estado salvo, se existir e não tiver expirado
+
+        Estados expirados são removidos.
+        """
+        path = self.path_for(identity)
+        created = self.created_at(identity)
+        if created is None or not os.path.exists(path):
+            return None
+
+        if time.time() - created > self.max_age_seconds:
+            for stale in (path, self.created_path_for(identity)):
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+            return None
+
+        return path
+
+    async def save(self, context, identity: str) -> Optional[str]:
+        """Grava o estado atual do contexto Playwright"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path_for(identity)
+        tmp_path = f"{path}.tmp"
+        try:
+            await context.storage_state(path=tmp_path)
+            os.replace(tmp_path, path)
+            created_path = self.created_path_for(identity)
+            if not os.path.exists(created_path):
+                # Sessão nova: regravações seguintes não renovam a idade
+                with open(created_path, 'w', encoding='utf-8') as f:
+                    f.write(f"{time.time():.0f}")
+            return path
+        except Exception as e:
+            print(f"   ⚠️  Erro ao salvar storage state: {e}")
+            return None
@@ -2,10 +2,7 @@
 Cliente para envio de resultados via Telegram Bot API
 """
 import os
-import json
-import requests
 from datetime import datetime
-from typing import List, Dict
 
 
 class TelegramBot:
@@ -24,57 +21,36 @@ class TelegramBot:
         self.base_url = f"https://api.telegram.org/bot{self.bot_token}"
         print("✅ Telegram Bot inicializado")
     
-    def send_json_file(self, professionals_list: List[Dict]) -> bool:
+    def send_file(self, filepath: str, total: int, cities_count: int,
+                  mime_type: str = 'application/octet-stream') -> bool:
         """
-        Converte lista de profissionais para JSON e envia via Telegram
+        Envia arquivo já exportado em disco (JSON, CSV, Parquet ou SQLite)
+        
+        O arquivo é enviado em streaming, sem carregar o conteúdo em memória.
         
         Args:
-            professionals_list: Lista de dicionários com dados dos profissionais
+            filepath: Caminho do arquivo exportado
+            total: Total de profissionais no arquivo
+            cities_count: Número de cidades no arquivo
+            mime_type: Tipo MIME do anexo
         
         Returns:
             True se enviado com sucesso, False caso contrário
         """
         try:
-            # Gerar nome do arquivo com data atual
-            date_str = datetime.now().strftime("%Y%m%d")
-            filename = f"guincho_{date_str}.json"
-            
-            # Converter para JSON com formatação
-            json_content = json.dumps(
-                professionals_list,
-                indent=2,
-                ensure_ascii=False
-            )
-            
-            # Criar resumo para caption
-            total = len(professionals_list)
-            cities = len(set(p.get('cidade', '') for p in professionals_list))
-            date_today = datetime.now().strftime("%d/%m/%Y")
-            
-            caption = (
-                f"🚗 Scraping GetNinjas - Guincho\n"
-                f"📅 Data: {date_today}\n"
-                f"👥 Total: {total} profissionais\n"
-                f"🏙️  Cidades: {cities}\n"
-                f"✅ Coleta finalizada com sucesso!"
-            )
-            
-            # Preparar requisição
+            filename = os.path.basename(filepath)
             url = f"{self.base_url}/sendDocument"
             
             data = {
                 'chat_id': self.chat_id,
-                'caption': caption,
+                'caption': self._build_caption(total, cities_count),
                 'parse_mode': 'HTML'
             }
             
-            files = {
-                'document': (filename, json_content.encode('utf-8'), 'application/json')
-            }
-            
-            # Enviar documento
             print(f"📤 Enviando arquivo {filename} para Telegram...")
-            response = requests.post(url, data=data, files=files, timeout=30)
+            with open(filepath, 'rb') as f:
+                files = {'document': (filename, f, mime_type)}
+                response = self._post(url, data=data, files=files, timeout=60)
             
             if response.status_code == 200:
                 print("✅ Arquivo enviado com sucesso!")
@@ -88,6 +64,23 @@ class TelegramBot:
             print(f"❌ Erro ao enviar arquivo para Telegram: {e}")
             return False
     
+    def _post(self, url: str, **kwargs):
+        """POST na API do Telegram (requests só é importado quando há envio)"""
+        import requests
+        return requests.post(url, **kwargs)
+    
+    def _build_caption(self, total: int, cities_count: int) -> str:
+        """Monta legenda padrão dos arquivos enviados"""
+        date_today = datetime.now().strftime("%d/%m/%Y")
+        
+        return (
+            f"🚗 Scraping GetNinjas - Guincho\n"
+            f"📅 Data: {date_today}\n"
+            f"👥 Total: {total} profissionais\n"
+            f"🏙️  Cidades: {cities_count}\n"
+            f"✅ Coleta finalizada com sucesso!"
+        )
+    
     def send_summary_message(self, total: int, cities_count: int, date: str) -> bool:
         """
         Envia mensagem de texto com resumo da coleta
@@ -117,7 +110,7 @@ class TelegramBot:
                 'parse_mode': 'HTML'
             }
             
-            response = requests.post(url, data=data, timeout=30)
+            response = self._post(url, data=data, timeout=30)
             
             if response.status_code == 200:
                 print("✅ Mensagem resumo enviada!")
@@ -150,7 +143,7 @@ class TelegramBot:
                 'parse_mode': 'HTML'
             }
             
-            response = requests.post(url, data=data, timeout=30)
+            response = self._post(url, data=data, timeout=30)
             return response.status_code == 200
         
         except Exception:
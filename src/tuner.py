@@ -0,0 +1,336 @@
+"""
+Ajuste automático de pacing, timeouts e cidades por dia
+
+Varre combinações de DELAY_MIN/MAX, DELAY_BETWEEN_EXTRACTIONS,
+TIMEOUT_NAVIGATION e TIMEOUT_ELEMENT contra um alvo simulado (latência
+com cauda longa, proxies mortos e bloqueio que cresce com a agressividade
+do pacing). Cada combinação roda o orquestrador real em VirtualClock, então
+centenas de cidades levam milissegundos.
+
+Saída: curvas de throughput e taxa de erro por parâmetro, relatório JSON e
+um perfil recomendado que o config carrega com SCRAPER_PROFILE=<nome>.
+"""
+import asyncio
+import contextlib
+import io
+import itertools
+import json
+import math
+import os
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+import config
+from cities import get_all_cities
+from clock import VirtualClock
+from event_log import EventLog, set_event_log
+from orchestrator import run_sequential
+
+
+# Valores varridos por padrão (DELAY_MAX acompanha DELAY_MIN × 2)
+DEFAULT_GRID = {
+    "DELAY_MIN": [10, 20, 30, 45, 60],
+    "DELAY_BETWEEN_EXTRACTIONS": [0.5, 1.0, 1.5],
+    "TIMEOUT_NAVIGATION": [20000, 45000, 90000],
+    "TIMEOUT_ELEMENT": [5000, 15000],
+}
+
+REPORT_DIR = "output/tuning"
+
+# Crescimento máximo de MAX_CITIES_PER_DAY por perfil (× valor atual): o resto
+# vem de medições reais, não das penalidades inventadas do simulador
+MAX_CITIES_GROWTH = 2
+
+
+class SimulatedTarget:
+    """
+    Alvo sintético que imita o Google Search visto pelo scraper
+
+    Args:
+        latency_median: Mediana (s) da navegação até domcontentloaded
+        latency_sigma: Dispersão lognormal da navegação (cauda)
+        dead_proxy_rate: Fração de navegações que nunca respondem
+        render_median: Mediana (s) até os resultados aparecerem
+        base_block_rate: Probabilidade de CAPTCHA com pacing folgado
+        pace_penalty: Bloqueio extra quando o intervalo entre buscas tende a zero
+        safe_gap: Intervalo (s) entre buscas a partir do qual não há penalidade
+        extraction_penalty: Bloqueio extra com extração rápida demais
+        safe_extraction_delay: Delay (s) entre extrações sem penalidade
+        streak_penalty: Bloqueio extra por bloqueio recente (IP marcado)
+    """
+
+    def __init__(self, latency_median: float = 8.0, latency_sigma: float = 0.8,
+                 dead_proxy_rate: float = 0.03, render_median: float = 2.0,
+                 base_block_rate: float = 0.02, pace_penalty: float = 0.5,
+                 safe_gap: float = 40.0, extraction_penalty: float = 0.15,
+                 safe_extraction_delay: float = 1.2, streak_penalty: float = 0.1):
+        self.latency_median = latency_median
+        self.latency_sigma = latency_sigma
+        self.dead_proxy_rate = dead_proxy_rate
+        self.render_median = render_median
+        self.base_block_rate = base_block_rate
+        self.pace_penalty = pace_penalty
+        self.safe_gap = safe_gap
+        self.extraction_penalty = extraction_penalty
+        self.safe_extraction_delay = safe_extraction_delay
+        self.streak_penalty = streak_penalty
+
+    def as_dict(self) -> Dict:
+        return dict(vars(self))
+
+
+class TrialStats:
+    """Resultado de uma combinação de parâmetros"""
+
+    def __init__(self, params: Dict):
+        self.params = params
+        self.cities = 0
+        self.records = 0
+        self.errors = {"timeout": 0, "bloqueio": 0, "elemento": 0}
+        self.simulated_seconds = 0.0
+
+    @property
+    def failed(self) -> int:
+        return sum(self.errors.values())
+
+    @property
+    def error_rate(self) -> float:
+        return self.failed / self.cities if self.cities else 0.0
+
+    @property
+    def records_per_hour(self) -> float:
+        return self.records / (self.simulated_seconds / 3600) if self.simulated_seconds else 0.0
+
+    @property
+    def cities_per_hour(self) -> float:
+        return self.cities / (self.simulated_seconds / 3600) if self.simulated_seconds else 0.0
+
+    def as_dict(self) -> Dict:
+        return {
+            "parametros": self.params,
+            "cidades": self.cities,
+            "registros": self.records,
+            "erros": dict(self.errors),
+            "taxa_erro": round(self.error_rate, 4),
+            "registros_por_hora": round(self.records_per_hour, 1),
+            "cidades_por_hora": round(self.cities_per_hour, 2),
+        }
+
+
+@contextlib.contextmanager
+def override_config(**params):
+    """Aplica parâmetros no módulo config durante o bloco e restaura depois"""
+    previous = {name: getattr(config, name) for name in params}
+    for name, value in params.items():
+        setattr(config, name, value)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            setattr(config, name, value)
+
+
+def expand_grid(grid: Dict[str, List]) -> Iterator[Dict]:
+    """Produto cartesiano da grade (DELAY_MAX derivado de DELAY_MIN)"""
+    names = list(grid)
+    for values in itertools.product(*(grid[name] for name in names)):
+        params = dict(zip(names, values))
+        if "DELAY_MIN" in params and "DELAY_MAX" not in grid:
+            params["DELAY_MAX"] = params["DELAY_MIN"] * 2
+        yield params
+
+
+def run_trial(params: Dict, target: SimulatedTarget, n_cities: int = 200, seed: int = 42) -> TrialStats:
+    """Simula n_cities com os parâmetros dados, no orquestrador real e em tempo virtual"""
+    clock = VirtualClock(seed=seed)
+    rng = clock.random
+    stats = TrialStats(params)
+    all_cities = get_all_cities()
+    cities = [all_cities[i % len(all_cities)] for i in range(n_cities)]
+    state = {"last_request": None, "recent_blocks": 0}
+
+    async def scrape_one(city: str, state_uf: str):
+        stats.cities += 1
+        gap = clock.now() - state["last_request"] if state["last_request"] is not None else target.safe_gap
+
+        # Navegação: proxy morto ou latência lognormal; o timeout corta as duas
+        timeout_nav = config.TIMEOUT_NAVIGATION / 1000
+        if rng.random() < target.dead_proxy_rate:
+            latency = math.inf
+        else:
+            latency = rng.lognormvariate(math.log(target.latency_median), target.latency_sigma)
+
+        if latency > timeout_nav:
+            await clock.sleep(timeout_nav)
+            stats.errors["timeout"] += 1
+            state["last_request"] = clock.now()
+            raise TimeoutError("navegação")
+
+        await clock.sleep(latency)
+        state["last_request"] = clock.now()
+        await clock.sleep(clock.uniform(3, 5) + 2)
+
+        # Bloqueio cresce com pacing agressivo e com bloqueios recentes
+        p_block = (
+            target.base_block_rate
+            + target.pace_penalty * max(0.0, 1 - gap / target.safe_gap)
+            + target.extraction_penalty * max(0.0, 1 - config.DELAY_BETWEEN_EXTRACTIONS / target.safe_extraction_delay)
+            + target.streak_penalty * state["recent_blocks"]
+        )
+        if rng.random() < min(p_block, 0.95):
+            stats.errors["bloqueio"] += 1
+            state["recent_blocks"] = min(state["recent_blocks"] + 1, 3)
+            return []
+        state["recent_blocks"] = max(state["recent_blocks"] - 1, 0)
+
+        # Resultados precisam renderizar dentro do TIMEOUT_ELEMENT
+        render = rng.lognormvariate(math.log(target.render_median), 1.0)
+        if render > config.TIMEOUT_ELEMENT / 1000:
+            await clock.sleep(config.TIMEOUT_ELEMENT / 1000)
+            stats.errors["elemento"] += 1
+            return []
+        await clock.sleep(render)
+
+        # Extração: ~60% dos resultados têm telefone, até MAX_PROFESSIONALS_PER_CITY
+        found = min(config.MAX_PROFESSIONALS_PER_CITY, int(rng.randint(8, 30) * 0.6))
+        await clock.sleep(found * 2 * config.DELAY_BETWEEN_EXTRACTIONS)
+        stats.records += found
+        return [None] * found
+
+    # Eventos da simulação não vão para o JSONL da execução real
+    previous_log = set_event_log(EventLog(directory=None))
+    try:
+        with override_config(**params), contextlib.redirect_stdout(io.StringIO()):
+            asyncio.run(run_sequential(cities, scrape_one, clock=clock))
+    finally:
+        set_event_log(previous_log)
+
+    stats.simulated_seconds = clock.now()
+    return stats
+
+
+def marginal_curves(trials: List[TrialStats], grid: Dict[str, List]) -> Dict[str, List[Dict]]:
+    """Média de throughput e taxa de erro para cada valor de cada parâmetro"""
+    curves = {}
+    for name, values in grid.items():
+        curve = []
+        for value in values:
+            subset = [t for t in trials if t.params[name] == value]
+            curve.append({
+                "valor": value,
+                "registros_por_hora": round(sum(t.records_per_hour for t in subset) / len(subset), 1),
+                "taxa_erro": round(sum(t.error_rate for t in subset) / len(subset), 4),
+            })
+        curves[name] = curve
+    return curves
+
+
+def recommend(trials: List[TrialStats], max_error_rate: float, budget_minutes: float,
+              min_delay: float = 0.0) -> Optional[Dict]:
+    """
+    Melhor combinação: maior registros/hora com taxa de erro dentro do limite
+
+    Combinações com DELAY_MIN abaixo de min_delay (o safe_gap do alvo simulado)
+    ficam de fora. MAX_CITIES_PER_DAY é derivado do tempo médio por cidade da
+    combinação escolhida, com 10% de folga no orçamento do job, limitado a
+    MAX_CITIES_GROWTH × o valor do config.py e à rotação inteira.
+    """
+    eligible = [
+        t for t in trials
+        if t.error_rate <= max_error_rate and t.params.get("DELAY_MIN", min_delay) >= min_delay
+    ]
+    if not eligible:
+        return None
+
+    best = max(eligible, key=lambda t: t.records_per_hour)
+    seconds_per_city = best.simulated_seconds / best.cities
+    params = dict(best.params)
+    fits = int(budget_minutes * 60 * 0.9 / seconds_per_city)
+    # Base: valor do config.py, não o de um perfil já aplicado (senão cada tune dobraria)
+    ceiling = min(config.PROFILE_DEFAULTS["MAX_CITIES_PER_DAY"] * MAX_CITIES_GROWTH, len(get_all_cities()))
+    params["MAX_CITIES_PER_DAY"] = max(1, min(fits, ceiling))
+    return {"parametros": params, "metricas": best.as_dict()}
+
+
+def print_curves(curves: Dict[str, List[Dict]]):
+    """Imprime as curvas marginais em tabela"""
+    for name, curve in curves.items():
+        print(f"\n📈 {name}")
+        print(f"   {'valor':>10}  {'registros/h':>12}  {'erro':>7}")
+        for point in curve:
+            print(f"   {point['valor']:>10}  {point['registros_por_hora']:>12.1f}  {point['taxa_erro']:>7.1%}")
+
+
+def write_profile(name: str, recommendation: Dict, target: SimulatedTarget) -> str:
+    """Grava o perfil em PROFILES_DIR/<nome>.json (carregado por SCRAPER_PROFILE)"""
+    os.makedirs(config.PROFILES_DIR, exist_ok=True)
+    path = config.profile_path(name)
+    profile = {
+        "perfil": name,
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "parametros": recommendation["parametros"],
+        "metricas": recommendation["metricas"],
+        "alvo_simulado": target.as_dict(),
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(profile, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def run_tuning(grid: Dict[str, List] = None, target: SimulatedTarget = None,
+               n_cities: int = 200, seed: int = 42, max_error_rate: float = 0.10,
+               budget_minutes: float = 150, profile_name: Optional[str] = "tuned") -> Optional[Dict]:
+    """
+    Executa a varredura completa e imprime/grava os resultados
+
+    Args:
+        grid: Valores por parâmetro (padrão: DEFAULT_GRID)
+        target: Alvo simulado (padrão: SimulatedTarget())
+        n_cities: Cidades simuladas por combinação
+        seed: Semente (mesma para todas as combinações: comparação justa)
+        max_error_rate: Taxa de erro máxima aceitável na recomendação
+        budget_minutes: Tempo disponível por execução (define MAX_CITIES_PER_DAY)
+        profile_name: Nome do perfil gravado (None = não grava)
+
+    Returns:
+        Recomendação (parâmetros e métricas) ou None se nada atender o limite
+    """
+    grid = grid or DEFAULT_GRID
+    target = target or SimulatedTarget()
+    combos = list(expand_grid(grid))
+
+    print(f"🎛️  Simulando {len(combos)} combinações × {n_cities} cidades (seed {seed})...")
+    trials = [run_trial(params, target, n_cities, seed) for params in combos]
+
+    curves = marginal_curves(trials, grid)
+    print_curves(curves)
+
+    recommendation = recommend(trials, max_error_rate, budget_minutes, min_delay=target.safe_gap)
+
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    report_path = os.path.join(REPORT_DIR, f"relatorio_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "alvo_simulado": target.as_dict(),
+            "cidades_por_combinacao": n_cities,
+            "seed": seed,
+            "curvas": curves,
+            "combinacoes": [t.as_dict() for t in trials],
+            "recomendacao": recommendation,
+        }, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 Relatório: {report_path}")
+
+    if not recommendation:
+        print(f"⚠️  Nenhuma combinação com taxa de erro ≤ {max_error_rate:.0%} e DELAY_MIN ≥ {target.safe_gap:.0f}s")
+        return None
+
+    metrics = recommendation["metricas"]
+    print(f"\n✅ Recomendado ({metrics['registros_por_hora']:.0f} registros/h, erro {metrics['taxa_erro']:.1%}):")
+    for name, value in recommendation["parametros"].items():
+        print(f"   {name} = {value}  (atual: {getattr(config, name)})")
+
+    if profile_name:
+        path = write_profile(profile_name, recommendation, target)
+        print(f"💾 Perfil: {path}  (use SCRAPER_PROFILE={profile_name})")
+
+    return recommendation